@@ -5,38 +5,52 @@
 # ویژگی‌ها: چهار عمل اصلی، پرانتز، درصد، توان (^)، جذر (√)، تاریخچه، مموری (MC/MR/M+/M−)
 # تمرکز روی سادگی کد و خوانایی – بدون eventFilter و استایل‌های پیچیده
 
-import sys, math, re
-from PyQt6.QtCore import Qt
+import sys, re, time
+from collections import deque
+_T0 = time.perf_counter()       # برای گزارش زمان شروع (--startup-report)
+
+from PyQt6.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QShortcut, QKeySequence
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QGridLayout,
-    QLineEdit, QLabel, QPushButton, QListWidget, QHBoxLayout, QMessageBox, QDockWidget
+    QLineEdit, QLabel, QPushButton, QListView, QHBoxLayout, QMessageBox, QDockWidget, QComboBox
 )
 
-# ----------------------- ارزیابی امن عبارت -----------------------
-# فقط توابع و ثابت‌های مجاز را معرفی می‌کنیم
-ALLOWED_FUNCS = {
-    "sqrt": math.sqrt, "sin": math.sin, "cos": math.cos, "tan": math.tan,
-    "asin": math.asin, "acos": math.acos, "atan": math.atan,
-    "log": math.log10, "ln": math.log, "abs": abs, "round": round,
-    "floor": math.floor, "ceil": math.ceil,
-    "pi": math.pi, "e": math.e
-}
-# الگوی کاراکترهای مجاز
-ALLOWED_PATTERN = re.compile(r"^[0-9\s\+\-\*/\.\%\^\(\)\,a-zA-Z]+$")
-
-def normalize(expr: str) -> str:
-    """تبدیل ورودی کاربر به چیزی که eval بفهمد"""
-    return (expr.replace("√", "sqrt")
-                .replace("^", "**"))
-
-def safe_eval(expr: str) -> float:
-    """ارزیابی امن و ساده با محدود کردن فضای اجرا"""
-    expr = normalize((expr or "").strip())
-    if not expr:
-        return 0.0
-    if "__" in expr or not ALLOWED_PATTERN.match(expr):
-        raise ValueError("عبارت نامعتبر/غیرامن")
-    return eval(expr, {"__builtins__": {}}, ALLOWED_FUNCS.copy())
+# ----------------------- موتور (بدون Qt) -----------------------
+# ارزیابی، قالب‌بندی، مموری و تاریخچه در calc_engine است؛ این فایل فقط رابط است.
+# داک تاریخچه، پروسه‌ی کارگر و استایل در اولین نیاز ساخته می‌شوند.
+from calc_engine import (ALLOWED_FUNCS, ALLOWED_PATTERN, normalize, safe_eval,
+                         fmt, num, Memory, History, open_store, IncrementalEvaluator,
+                         Worksheet, split_assignment, HISTORY_CAP, FLOAT, EXACT, DECIMAL)
+from calc_profile import Profiler, clock
+
+# حالت‌های عددی انتخاب‌شدنی: (برچسب، حالت، دقت Decimal)
+NUMBER_MODES = (("float", FLOAT, 0), ("exact", EXACT, 0),
+                ("dec 28", DECIMAL, 28), ("dec 50", DECIMAL, 50), ("dec 100", DECIMAL, 100))
+
+# ----------------------- پیش‌نمایش زنده (خارج از ترد رابط) -----------------------
+PREVIEW_DELAY_MS = 150      # debounce تایپ
+
+class _PreviewSignals(QObject):
+    done = pyqtSignal(int, object)      # (شماره‌ی درخواست، نتیجه یا None)
+
+class _PreviewTask(QRunnable):
+    """ارزیابی یک عبارت در QThreadPool؛ اگر تا شروع کار کهنه شده باشد اجرا نمی‌شود"""
+    def __init__(self, seq, expr, latest, signals, evaluate=safe_eval):
+        super().__init__()
+        self.seq, self.expr = seq, expr
+        self.latest = latest            # تابعی که شماره‌ی آخرین درخواست را می‌دهد
+        self.signals = signals
+        self.evaluate = evaluate
+
+    def run(self):
+        if self.seq != self.latest():
+            return
+        try:
+            val = self.evaluate(self.expr)
+        except Exception:
+            val = None
+        self.signals.done.emit(self.seq, val)
 
 # ----------------------- پنجره اصلی -----------------------
 class Calc(QMainWindow):
@@ -45,12 +59,39 @@ class Calc(QMainWindow):
         self.setWindowTitle("SimpleCalc • PyQt6")
         self.resize(420, 600)
 
-        # مموری و تاریخچه
-        self.memory = 0.0
-        self.history: list[tuple[str, float]] = []
-
+        # مموری، متغیرها (rate = 0.07، ans) و تاریخچه
+        self.memory = Memory()
+        self.sheet = Worksheet()
+        self.history = History(open_store())    # تاریخچه‌ی دائمی روی دیسک (اگر ممکن باشد)
+
+        # پیش‌نمایش: تایمر debounce + یک ترد جدا؛ نتایج کهنه با شماره‌ی درخواست کنار گذاشته می‌شوند
+        self._preview_seq = 0
+        self._live = IncrementalEvaluator(self.sheet.env)   # فقط تکه‌های ویرایش‌شده دوباره حساب می‌شوند
+        self._preview_pool = QThreadPool(self)
+        self._preview_pool.setMaxThreadCount(1)
+        self._preview_signals = _PreviewSignals(self)
+        self._preview_signals.done.connect(self._show_preview)
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(PREVIEW_DELAY_MS)
+        self._preview_timer.timeout.connect(self._start_preview)
+
+        # ارزیابی نهایی (=، 1/x، M±) در پروسه‌ی کارگر با سقف زمان؛ نتیجه با تایمر poll می‌شود
+        self.backend = None             # بعد از شروع حلقه‌ی رویداد راه‌اندازی می‌شود
+        self._on_eval_done = None
+        self._queued = deque()          # درخواست‌هایی که هنگام مشغول بودن کارگر رسیدند
+        self._eval_timer = QTimer(self)
+        self._eval_timer.setInterval(10)
+        self._eval_timer.timeout.connect(self._poll_eval)
+
+        # زمان‌سنجی مراحل (پیش‌فرض خاموش؛ Ctrl+Shift+P داک آن را باز می‌کند)
+        self.profiler = Profiler()
+        self.profile_dock = None
+        self._eval_t0 = 0
+
+        self._styled = False
         self._build_ui()
-        self._apply_style()
+        QTimer.singleShot(0, self._backend)     # گرم کردن کارگر بدون معطل کردن نمایش پنجره
 
     # --- ساخت رابط ---
     def _build_ui(self):
@@ -71,6 +112,7 @@ class Calc(QMainWindow):
         self.display.setAlignment(Qt.AlignmentFlag.AlignRight)
         self.display.setPlaceholderText("0")
         self.display.returnPressed.connect(self.evaluate)  # Enter = مساوی
+        self.display.textChanged.connect(self._schedule_preview)
         main.addWidget(self.display)
 
         # گرید دکمه‌ها
@@ -117,19 +159,33 @@ class Calc(QMainWindow):
         foot = QHBoxLayout()
         self.mem_label = QLabel("")     # نمایش مقدار مموری (اگر غیرصفر باشد)
         tip = QLabel("M • ^ توان • √ جذر • Esc=پاک • Enter = مساوی")
+        plot_btn = QPushButton("Plot")
+        plot_btn.clicked.connect(self.toggle_plot)
+        table_btn = QPushButton("Table")
+        table_btn.clicked.connect(self.toggle_table)
+        data_btn = QPushButton("Data")
+        data_btn.clicked.connect(lambda: self.show_data())
+        self.mode_box = QComboBox()     # float (سریع) • کسر دقیق • Decimal با دقت انتخابی
+        for label, mode, prec in NUMBER_MODES:
+            self.mode_box.addItem(label, (mode, prec))
+        self.mode_box.setToolTip("حالت عددی")
+        self.mode_box.currentIndexChanged.connect(self._schedule_preview)
         foot.addWidget(self.mem_label)
         foot.addStretch(1)
         foot.addWidget(tip)
+        foot.addWidget(plot_btn)
+        foot.addWidget(table_btn)
+        foot.addWidget(data_btn)
+        foot.addWidget(self.mode_box)
         main.addLayout(foot)
+        self.plot_dock = None           # داک نمودار در اولین استفاده ساخته می‌شود
+        self.table_dock = None          # داک‌های جدول و حالت داده هم همین‌طور
+        self.data_dock = None
 
-        # داک تاریخچه (قابل باز/بسته‌شدن)
-        self.dock = QDockWidget("History", self)
-        self.dock.setAllowedAreas(Qt.DockWidgetArea.RightDockWidgetArea | Qt.DockWidgetArea.LeftDockWidgetArea)
-        self.hist_list = QListWidget()
-        self.hist_list.itemDoubleClicked.connect(self._use_selected_history)
-        self.dock.setWidget(self.hist_list)
-        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.dock)
-        self.dock.hide()
+        # داک تاریخچه در اولین باز شدن ساخته می‌شود (_build_history_dock)
+        self.dock = None
+        self.hist_model = None
+        self.hist_index = None          # ایندکس جستجو در اولین جستجو ساخته می‌شود
 
         # کلیدهای ضروری
         self.shortcut_keys()
@@ -138,12 +194,19 @@ class Calc(QMainWindow):
     def shortcut_keys(self):
         # Esc = پاک‌کردن (با overrideKeyPress ساده‌تره)
         self.display.keyPressEvent = self._wrap_keypress(self.display.keyPressEvent)
+        QShortcut(QKeySequence("Ctrl+Shift+P"), self, activated=self.toggle_profile)
 
     def _wrap_keypress(self, orig_handler):
         def handler(ev):
             if ev.key() == Qt.Key.Key_Escape:
                 self.clear_all()
                 return
+            elif ev.matches(QKeySequence.StandardKey.Paste):
+                text = QApplication.clipboard().text()
+                if "\n" in text.strip():   # ستون عدد → حالت داده، نه نمایشگر
+                    self.show_data(text)
+                    return
+                return orig_handler(ev)
             elif ev.key() == Qt.Key.Key_Backspace:
                 # اجازه بده بک‌اسپیس پیش‌فرض هم کار کنه
                 return orig_handler(ev)
@@ -158,6 +221,7 @@ class Calc(QMainWindow):
     def clear_all(self):
         self.display.clear()
         self.sub.setText("")
+        self._cancel_preview()
 
     def backspace(self):
         t = self.display.text()
@@ -181,62 +245,172 @@ class Calc(QMainWindow):
     def reciprocal(self):
         """محاسبه 1/x روی کل عبارت فعلی"""
         cur = (self.display.text() or "0").strip()
-        self.sub.setText(f"1/({cur})")
-        try:
-            val = safe_eval(f"1/({cur})")
-            self.display.setText(self._fmt(val))
-            self._push_history(f"1/({cur})", val)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"عملیات نامعتبر:\n{e}")
+        expr = f"1/({cur})"
+        self.sub.setText(expr)
+        self._run_async(expr, lambda ok, val: self._finish_eval(expr, ok, val, "عملیات نامعتبر"))
+        self._cancel_preview()
 
     # ----------------------- مموری -----------------------
     def mem_clear(self):
-        self.memory = 0.0
+        self.memory.clear()
         self._update_mem_label()
 
     def mem_recall(self):
-        self.type_text(self._num(self.memory))
+        self.type_text(num(self.memory.value))
 
     def mem_add(self):
-        try:
-            v = safe_eval(self.display.text() or "0")
-            self.memory += v
-            self._update_mem_label()
-        except Exception:
-            pass
+        self._run_async(self.display.text() or "0", lambda ok, v: self._mem_apply(ok, v, self.memory.add))
 
     def mem_sub(self):
+        self._run_async(self.display.text() or "0", lambda ok, v: self._mem_apply(ok, v, self.memory.sub))
+
+    def _mem_apply(self, ok, v, op):
+        if not ok:
+            return
         try:
-            v = safe_eval(self.display.text() or "0")
-            self.memory -= v
-            self._update_mem_label()
-        except Exception:
-            pass
+            op(v)
+        except TypeError as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        self._update_mem_label()
 
     def _update_mem_label(self):
-        self.mem_label.setText(f"M: {self._num(self.memory)}" if abs(self.memory) > 1e-15 else "")
+        self.mem_label.setText(self.memory.label())
 
     # ----------------------- تاریخچه -----------------------
     def toggle_history(self):
+        if self.dock is None:
+            self._build_history_dock()
         self.dock.setVisible(not self.dock.isVisible())
 
-    def _push_history(self, expr: str, result: float):
-        self.history.append((expr, result))
-        self._refresh_history()
+    def _build_history_dock(self):
+        from history_model import HistoryModel
+        self.dock = QDockWidget("History", self)
+        self.dock.setAllowedAreas(Qt.DockWidgetArea.RightDockWidgetArea | Qt.DockWidgetArea.LeftDockWidgetArea)
+        self.hist_model = HistoryModel(num, HISTORY_CAP)    # بافر حلقوی؛ هر ارزیابی = یک سطر
+        self.hist_model.set_source(self.history)      # موارد قبلی فقط هنگام اسکرول خوانده می‌شوند
+        self.hist_list = QListView()
+        self.hist_list.setModel(self.hist_model)
+        self.hist_list.setUniformItemSizes(True)      # چیدمان تنبل برای تاریخچه‌ی بلند
+        self.hist_list.doubleClicked.connect(self._use_selected_history)
+        self.hist_search = QLineEdit()
+        self.hist_search.setPlaceholderText("جستجو: متن عبارت یا بازه‌ی نتیجه (10..20)")
+        self.hist_search.textChanged.connect(self._apply_history_search)
+        body = QWidget()
+        lay = QVBoxLayout(body)
+        lay.setContentsMargins(0, 0, 0, 0)
+        lay.addWidget(self.hist_search)
+        lay.addWidget(self.hist_list)
+        self.dock.setWidget(body)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.dock)
+        self.dock.hide()
 
-    def _refresh_history(self):
-        self.hist_list.clear()
-        for expr, res in reversed(self.history[-300:]):
-            self.hist_list.addItem(f"{expr} = {self._num(res)}")
+    def _push_history(self, expr: str, result: float):
+        evicted = self.history.push(expr, result)
+        if self.hist_index is not None:
+            if evicted:
+                self.hist_index.drop_oldest()       # شماره‌ها یکی جابه‌جا شدند
+            self.hist_index.add(len(self.history) - 1, expr, result)
+        if self.hist_model is not None:
+            if evicted:
+                self.hist_model.source_evicted()
+            self.hist_model.append(expr, result)
+            if self.hist_search.text().strip():
+                self._apply_history_search()
+
+    def _apply_history_search(self):
+        q = self.hist_search.text().strip()
+        if not q:
+            self.hist_model.set_filter(None)
+            return
+        if self.hist_index is None:     # ساخت یک‌باره؛ بعد از آن فقط افزایشی
+            from history_index import HistoryIndex
+            self.hist_index = HistoryIndex.build(self.history)
+        self.hist_model.set_filter(self.hist_index.search(q))
 
     def _use_selected_history(self):
-        item = self.hist_list.currentItem()
-        if not item:
+        idx = self.hist_list.currentIndex()
+        if not idx.isValid():
             return
-        text = item.text()
-        if "=" in text:
-            _, val = text.split("=", 1)
-            self.display.setText(val.strip())
+        _, val = self.hist_model.entry(idx.row())
+        self.display.setText(num(val))
+
+    # ----------------------- نمودار -----------------------
+    def toggle_plot(self):
+        if self.plot_dock is None:
+            try:
+                from plot_dock import PlotDock      # numpy فقط وقتی نمودار لازم است
+            except ImportError as e:
+                QMessageBox.critical(self, "Error", f"برای نمودار numpy لازم است:\n{e}")
+                return
+            self.plot_dock = PlotDock(self._numeric_vars, self)
+            self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.plot_dock)
+            self.plot_dock.hide()
+        if not self.plot_dock.isVisible() and not self.plot_dock.expr.text():
+            self.plot_dock.expr.setText(split_assignment(self.display.text())[1].strip())
+            self.plot_dock.apply()
+        self.plot_dock.setVisible(not self.plot_dock.isVisible())
+
+    # ----------------------- جدول f(x) -----------------------
+    def toggle_table(self):
+        if self.table_dock is None:
+            try:
+                from table_dock import TableDock    # numpy فقط وقتی جدول لازم است
+            except ImportError as e:
+                QMessageBox.critical(self, "Error", f"برای جدول numpy لازم است:\n{e}")
+                return
+            self.table_dock = TableDock(self._numeric_vars, self)
+            self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.table_dock)
+            self.table_dock.hide()
+        if not self.table_dock.isVisible() and not self.table_dock.expr.text():
+            self.table_dock.expr.setText(split_assignment(self.display.text())[1].strip())
+            self.table_dock.apply()
+        self.table_dock.setVisible(not self.table_dock.isVisible())
+
+    def _numeric_vars(self):
+        """متغیرهای عددی کاربرگ برای جدول و نمودار (x خود محور افقی است)"""
+        return {k: v for k, v in self.sheet.values.items()
+                if k != "x" and isinstance(v, (int, float))}
+
+    # ----------------------- حالت داده -----------------------
+    def show_data(self, text=None):
+        """باز کردن داک داده؛ با text همان متن (مثلاً کلیپ‌بورد) بارگذاری می‌شود"""
+        if self.data_dock is None:
+            try:
+                from data_dock import DataDock      # numpy فقط وقتی حالت داده لازم است
+            except ImportError as e:
+                QMessageBox.critical(self, "Error", f"برای حالت داده numpy لازم است:\n{e}")
+                return
+            self.data_dock = DataDock(self.display.setText, self)
+            self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.data_dock)
+        self.data_dock.show()
+        if text:
+            self.data_dock.load_clipboard(text)
+
+    # ----------------------- زمان‌سنجی -----------------------
+    def toggle_profile(self):
+        if self.profile_dock is None:
+            from profile_dock import ProfileDock
+            self.profile_dock = ProfileDock(self.profiler, self)
+            self.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, self.profile_dock)
+            self.profile_dock.hide()
+        self.profile_dock.setVisible(not self.profile_dock.isVisible())
+
+    # ----------------------- چرخه‌ی عمر پنجره -----------------------
+    def showEvent(self, ev):
+        if not self._styled:            # استایل فقط پیش از اولین نمایش
+            self._styled = True
+            self._apply_style()
+        super().showEvent(ev)
+
+    def closeEvent(self, ev):
+        self.history.close()
+        self._eval_timer.stop()
+        self._queued.clear()
+        if self.backend is not None:
+            self.backend.close()
+            self.backend = None
+        super().closeEvent(ev)
 
     # ----------------------- ارزیابی -----------------------
     def evaluate(self):
@@ -244,22 +418,107 @@ class Calc(QMainWindow):
         if not expr:
             return
         self.sub.setText(expr)
+        name, rhs = split_assignment(expr)      # "rate = 0.07" → فقط سمت راست به کارگر می‌رود
+        self._run_async(rhs, lambda ok, val: self._finish_eval(expr, ok, val, "عبارت نامعتبر", name, rhs))
+        self._cancel_preview()
+
+    def _backend(self):
+        if self.backend is None:
+            from calc_worker import EvalBackend     # multiprocessing فقط اینجا import می‌شود
+            self.backend = EvalBackend()
+        return self.backend
+
+    def _run_async(self, expr, on_done):
+        """ارسال به پروسه‌ی کارگر؛ on_done(ok, نتیجه) بعد از پایان صدا زده می‌شود"""
+        backend = self._backend()
+        if backend.busy:
+            # تا پایان ارزیابی قبلی در صف می‌ماند و بعد به ترتیب فرستاده می‌شود
+            self._queued.append((expr, on_done))
+            self.sub.setText(f"در صف… ({len(self._queued)})")
+            return
+        if self.profiler.enabled:
+            self._eval_t0 = clock()
+        mode, prec = self.mode_box.currentData()
+        backend.submit(expr, self.profiler.enabled, self.sheet.values, mode, prec)
+        self._on_eval_done = on_done
+        self._eval_timer.start()
+
+    def _poll_eval(self):
+        res = self.backend.poll()
+        if res is None:
+            return
+        self._eval_timer.stop()
+        if self.profiler.enabled and self.backend.timings:
+            self.profiler.record_all(self.backend.timings)
+        on_done, self._on_eval_done = self._on_eval_done, None
+        on_done(*res)
+        if self._queued and self.backend is not None:
+            self._run_async(*self._queued.popleft())
+
+    def _finish_eval(self, expr, ok, val, title, name=None, rhs=None):
         try:
-            val = safe_eval(expr)
-            self.display.setText(self._fmt(val))
-            self._push_history(expr, val)
+            if not ok:
+                raise ValueError(val)
+            self._assign(name, rhs, val)
+            if not self.profiler.enabled:
+                self.display.setText(self._fmt(val))
+                self._push_history(expr, val)
+            else:
+                t0 = clock()
+                text = self._fmt(val)
+                t1 = clock()
+                self.display.setText(text)
+                self._push_history(expr, val)
+                t2 = clock()
+                self.profiler.record("format", t1 - t0)
+                self.profiler.record("history", t2 - t1)
+                self.profiler.record("total", t2 - self._eval_t0)
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"عبارت نامعتبر:\n{e}")
+            QMessageBox.critical(self, "Error", f"{title}:\n{e}")
+        self._cancel_preview()
+
+    def _assign(self, name, rhs, val):
+        """ثبت تعریف (اگر بود) و ans؛ وابسته‌ها فقط همین‌جا دوباره حساب می‌شوند"""
+        if name is not None:
+            changed = self.sheet.define(name, rhs, val)
+            more = f"  • {len(changed) - 1} وابسته به‌روز شد" if len(changed) > 1 else ""
+            self.sub.setText(f"{name} = {self._fmt(val)}{more}")
+        self.sheet.set_value("ans", val)
+        # ارزیاب تازه به جای clear: پیش‌نمایشی که هنوز در QThreadPool روی قبلی کار
+        # می‌کند مقدار متغیرهای قدیمی را فقط در کش همان قبلی می‌نویسد
+        self._live = IncrementalEvaluator(self.sheet.env)
+
+    # ----------------------- پیش‌نمایش زنده -----------------------
+    def _schedule_preview(self):
+        self._preview_seq += 1          # هر نتیجه‌ی در راه، از این لحظه کهنه است
+        self._preview_timer.start()
+
+    def _start_preview(self):
+        expr = split_assignment(self.display.text())[1].strip()
+        if not expr:
+            self.sub.setText("")
+            return
+        mode, prec = self.mode_box.currentData()      # پیش‌نمایش در همان حالت عددی "="
+        live = self._live
+        task = _PreviewTask(self._preview_seq, expr, lambda: self._preview_seq,
+                            self._preview_signals, lambda e: live.evaluate(e, mode, prec))
+        self._preview_pool.start(task)
+
+    def _show_preview(self, seq, val):
+        if seq != self._preview_seq:
+            return                      # متن از زمان درخواست عوض شده
+        self.sub.setText("" if val is None else f"= {self._fmt(val)}")
+
+    def _cancel_preview(self):
+        self._preview_timer.stop()
+        self._preview_seq += 1
 
     # ----------------------- کمکی‌ها -----------------------
     def _fmt(self, v: float) -> str:
-        """نمایش مناسب عدد (حذف اعشار اضافی)"""
-        if abs(v - int(v)) < 1e-12:
-            return str(int(round(v)))
-        return f"{v:.12g}"
+        return fmt(v)
 
     def _num(self, v: float) -> str:
-        return f"{v:.12g}"
+        return num(v)
 
     # ----------------------- استایل خیلی ساده (اختیاری) -----------------------
     def _apply_style(self):
@@ -277,16 +536,37 @@ class Calc(QMainWindow):
             }
             QPushButton:hover { background: #243044; }
             QPushButton:pressed { background: #2b3a52; }
-            QListWidget {
+            QListView {
                 background: #111827; border: 1px solid #202635; border-radius: 8px;
             }
         """)
 
 # ----------------------- main -----------------------
+def _startup_report(stages):
+    """چاپ زمان هر مرحله‌ی شروع (میلی‌ثانیه، از ابتدای import این فایل)"""
+    prev, parts = _T0, []
+    for name, t in stages:
+        parts.append(f"{name} {1000 * (t - prev):.1f}")
+        prev = t
+    parts.append(f"total {1000 * (prev - _T0):.1f}")
+    print("startup (ms): " + " | ".join(parts), file=sys.stderr)
+
 def main():
+    report = "--startup-report" in sys.argv     # اندازه‌گیری شروع سرد و خروج
+    stages = [("imports", time.perf_counter())]
     app = QApplication(sys.argv)
+    stages.append(("QApplication", time.perf_counter()))
     w = Calc()
+    w.profiler.enabled = "--profile" in sys.argv     # زمان‌سنجی از همان ابتدا
+    stages.append(("window", time.perf_counter()))
     w.show()
+    if report:
+        def done():
+            stages.append(("first frame", time.perf_counter()))
+            _startup_report(stages)
+            w.close()
+            app.quit()
+        QTimer.singleShot(0, done)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@ import sys, math, re
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QGridLayout, QLineEdit, QLabel, QPushButton, QMessageBox)
+from calc_engine import compile_expr, fmt
 
 ALLOWED_FUNCS = {"sqrt": math.sqrt, "abs": abs, "round": round}
 ALLOWED_PATTERN = re.compile(r"^[0-9\s\+\-\*/\.\%\^\(\)a-zA-Z]+$")
@@ -17,7 +18,7 @@ def safe_eval(expr: str) -> float:
         raise ValueError("Invalid/unsafe")
     # تبدیل درصد ساده: "50%" => "50/100"
     expr = re.sub(r"(\d+(\.\d+)?)\%", r"(\1/100)", expr)
-    return eval(expr, {"__builtins__": {}}, ALLOWED_FUNCS.copy())
+    return compile_expr(expr)(ALLOWED_FUNCS)  # پارس یک‌باره + کش
 
 class Calc(QMainWindow):
     def __init__(self):
@@ -67,7 +68,7 @@ class Calc(QMainWindow):
             QMessageBox.critical(self, "Error", f"عبارت نامعتبر:\n{e}")
 
     def _fmt(self, v: float) -> str:
-        return str(int(v)) if abs(v-int(v))<1e-12 else f"{v:.12g}"
+        return fmt(v)
 
 def main():
     app = QApplication(sys.argv)
@@ -3,7 +3,9 @@ import sys, math, re
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QGridLayout, QLineEdit, QLabel, QPushButton, QMessageBox,
-                             QDockWidget, QListWidget)
+                             QDockWidget, QListView)
+from calc_engine import compile_expr, fmt, num, History
+from history_model import HistoryModel
 
 ALLOWED_FUNCS = {"sqrt": math.sqrt, "abs": abs, "round": round}
 ALLOWED_PATTERN = re.compile(r"^[0-9\s\+\-\*/\.\%\^\(\)a-zA-Z]+$")
@@ -17,14 +19,14 @@ def safe_eval(expr: str) -> float:
     if "__" in expr or not ALLOWED_PATTERN.match(expr):
         raise ValueError("Invalid/unsafe")
     expr = re.sub(r"(\d+(\.\d+)?)\%", r"(\1/100)", expr)
-    return eval(expr, {"__builtins__": {}}, ALLOWED_FUNCS.copy())
+    return compile_expr(expr)(ALLOWED_FUNCS)  # پارس یک‌باره + کش
 
 class Calc(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Calc • Step 5 (History)")
         self.resize(520, 560)
-        self.history = []
+        self.history = History()
 
         root = QWidget(); self.setCentralWidget(root)
         main = QVBoxLayout(root)
@@ -58,8 +60,10 @@ class Calc(QMainWindow):
 
         # داک تاریخچه
         self.dock = QDockWidget("History", self)
-        self.hist_list = QListWidget()
-        self.hist_list.itemDoubleClicked.connect(self.use_selected)
+        self.hist_model = HistoryModel(self._num)
+        self.hist_list = QListView(); self.hist_list.setModel(self.hist_model)
+        self.hist_list.setUniformItemSizes(True)
+        self.hist_list.doubleClicked.connect(self.use_selected)
         self.dock.setWidget(self.hist_list)
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.dock)
         self.dock.hide()
@@ -80,22 +84,20 @@ class Calc(QMainWindow):
             QMessageBox.critical(self, "Error", f"عبارت نامعتبر:\n{e}")
 
     def push_history(self, expr, val):
-        self.history.append((expr, val))
-        self.hist_list.clear()
-        for e, v in reversed(self.history[-300:]):
-            self.hist_list.addItem(f"{e} = {self._num(v)}")
+        self.history.push(expr, val)
+        self.hist_model.append(expr, val)   # فقط یک سطر جدید
 
     def use_selected(self):
-        item = self.hist_list.currentItem()
-        if not item: return
-        _, val = item.text().split("=", 1)
-        self.display.setText(val.strip())
+        idx = self.hist_list.currentIndex()
+        if not idx.isValid(): return
+        _, val = self.hist_model.entry(idx.row())
+        self.display.setText(self._num(val))
 
     def _fmt(self, v: float) -> str:
-        return str(int(v)) if abs(v-int(v))<1e-12 else f"{v:.12g}"
+        return fmt(v)
 
     def _num(self, v: float) -> str:
-        return f"{v:.12g}"
+        return num(v)
 
 def main():
     app = QApplication(sys.argv)
@@ -3,7 +3,9 @@ import sys, math, re
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QGridLayout, QLineEdit, QLabel, QPushButton, QMessageBox,
-                             QDockWidget, QListWidget, QHBoxLayout)
+                             QDockWidget, QListView, QHBoxLayout)
+from calc_engine import compile_expr, fmt, num, Memory, History
+from history_model import HistoryModel
 
 ALLOWED_FUNCS = {"sqrt": math.sqrt, "abs": abs, "round": round}
 ALLOWED_PATTERN = re.compile(r"^[0-9\s\+\-\*/\.\%\^\(\)a-zA-Z]+$")
@@ -17,15 +19,15 @@ def safe_eval(expr: str) -> float:
     if "__" in expr or not ALLOWED_PATTERN.match(expr):
         raise ValueError("Invalid/unsafe")
     expr = re.sub(r"(\d+(\.\d+)?)\%", r"(\1/100)", expr)
-    return eval(expr, {"__builtins__": {}}, ALLOWED_FUNCS.copy())
+    return compile_expr(expr)(ALLOWED_FUNCS)  # پارس یک‌باره + کش
 
 class Calc(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Calc • Step 6 (Memory + Style)")
         self.resize(540, 600)
-        self.history = []
-        self.memory = 0.0
+        self.history = History()
+        self.memory = Memory()
 
         root = QWidget(); self.setCentralWidget(root)
         main = QVBoxLayout(root); main.setContentsMargins(16,16,16,16)
@@ -71,7 +73,9 @@ class Calc(QMainWindow):
 
         # تاریخچه
         self.dock = QDockWidget("History", self)
-        self.hist_list = QListWidget(); self.hist_list.itemDoubleClicked.connect(self.use_selected)
+        self.hist_model = HistoryModel(self._num)
+        self.hist_list = QListView(); self.hist_list.setModel(self.hist_model); self.hist_list.setUniformItemSizes(True)
+        self.hist_list.doubleClicked.connect(self.use_selected)
         self.dock.setWidget(self.hist_list); self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.dock)
         self.dock.hide()
 
@@ -90,7 +94,7 @@ class Calc(QMainWindow):
             }
             QPushButton:hover { background: #243044; }
             QPushButton:pressed { background: #2b3a52; }
-            QListWidget {
+            QListView {
                 background: #111827; border: 1px solid #202635; border-radius: 8px;
             }
         """)
@@ -106,29 +110,26 @@ class Calc(QMainWindow):
         if t: self.display.setText(t[:-1])
 
     # مموری
-    def mem_clear(self): self.memory = 0.0; self._update_mem()
-    def mem_recall(self): self.type_text(self._num(self.memory))
+    def mem_clear(self): self.memory.clear(); self._update_mem()
+    def mem_recall(self): self.type_text(self._num(self.memory.value))
     def mem_add(self):
-        try: self.memory += safe_eval(self.display.text() or "0"); self._update_mem()
+        try: self.memory.add(safe_eval(self.display.text() or "0")); self._update_mem()
         except: pass
     def mem_sub(self):
-        try: self.memory -= safe_eval(self.display.text() or "0"); self._update_mem()
+        try: self.memory.sub(safe_eval(self.display.text() or "0")); self._update_mem()
         except: pass
-    def _update_mem(self):
-        self.mem_label.setText(f"M: {self._num(self.memory)}" if abs(self.memory)>1e-15 else "")
+    def _update_mem(self): self.mem_label.setText(self.memory.label())
 
     # تاریخچه
     def toggle_history(self): self.dock.setVisible(not self.dock.isVisible())
     def push_history(self, expr, val):
-        self.history.append((expr, val))
-        self.hist_list.clear()
-        for e, v in reversed(self.history[-300:]):
-            self.hist_list.addItem(f"{e} = {self._num(v)}")
+        self.history.push(expr, val)
+        self.hist_model.append(expr, val)   # فقط یک سطر جدید
     def use_selected(self):
-        it = self.hist_list.currentItem()
-        if not it: return
-        _, v = it.text().split("=", 1)
-        self.display.setText(v.strip())
+        idx = self.hist_list.currentIndex()
+        if not idx.isValid(): return
+        _, v = self.hist_model.entry(idx.row())
+        self.display.setText(self._num(v))
 
     # محاسبه
     def evaluate(self):
@@ -143,10 +144,8 @@ class Calc(QMainWindow):
             QMessageBox.critical(self, "Error", f"عبارت نامعتبر:\n{e}")
 
     # کمکی‌ها
-    def _fmt(self, v: float) -> str:
-        return str(int(v)) if abs(v-int(v))<1e-12 else f"{v:.12g}"
-    def _num(self, v: float) -> str:
-        return f"{v:.12g}"
+    def _fmt(self, v: float) -> str: return fmt(v)
+    def _num(self, v: float) -> str: return num(v)
 
     def _wrap_keypress(self, orig):
         def handler(ev):
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# بنچمارک موتورهای ارزیابی فایل‌های calc0x و CALC – بدون اجرای Qt
+# از هر فایل فقط importهای سبک، ثابت‌ها و توابع سطح ماژول (normalize/safe_eval)
+# برداشته و اجرا می‌شوند؛ کلاس پنجره و importهای PyQt6 کنار گذاشته می‌شوند.
+#
+#   cd Calc
+#   python calc_bench.py --out bench.json
+#   python calc_bench.py --out new.json --compare bench.json
+
+import os, sys, ast, json, time, argparse, platform, subprocess, tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ENGINE_FILES = ["calc02.py", "calc03.py", "calc04.py", "calc05.py", "calc06.py", "CALC.py"]
+SAFE_IMPORTS = {"math", "re", "sys", "time", "calc_engine"}
+
+# ----------------------- مجموعه‌ی عبارت‌ها -----------------------
+CORPUS = {
+    "short": ["1+2", "7*8", "9-3", "42/6", "(2+3)"],
+    "long": ["+".join(f"{i}*{i + 1}" for i in range(1, 60)),
+             "-".join(f"{i}.5/{i}" for i in range(1, 60))],
+    "nested": ["(" * 30 + "1+2" + ")*2" * 30,
+               "((((1+2)*(3+4))/((5-6)*(7+8)))-((9+1)*(2-3)))"],
+    "percent": ["50%", "12.5%*80", "100-15%*100", "20%+30%+40%"],
+    "function": ["sqrt(16)+abs(-3)+round(2.567, 2)", "sqrt(abs(-81))*sqrt(2)",
+                 "sin(pi/4)*sin(pi/4)+cos(pi/4)^2", "ln(e^3)+log(1000)+floor(2.7)"],
+}
+
+# ----------------------- بارگذاری موتورها -----------------------
+def _keep(node) -> bool:
+    if isinstance(node, ast.Import):
+        return all(a.name in SAFE_IMPORTS for a in node.names)
+    if isinstance(node, ast.ImportFrom):
+        return node.module in SAFE_IMPORTS
+    return isinstance(node, (ast.Assign, ast.AnnAssign, ast.FunctionDef))
+
+def load_engine(path: str):
+    """safe_eval یک فایل، بدون import کردن Qt؛ اگر فایل موتوری نداشت None"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    tree.body = [n for n in tree.body if _keep(n) and not
+                 (isinstance(n, ast.FunctionDef) and n.name == "main")]
+    ns = {"__name__": "bench_" + os.path.basename(path)}
+    exec(compile(tree, path, "exec"), ns)
+    return ns.get("safe_eval")
+
+# ----------------------- اندازه‌گیری -----------------------
+def _percentile(sorted_ns, q):
+    return sorted_ns[min(len(sorted_ns) - 1, int(q * len(sorted_ns)))]
+
+def bench(fn, exprs, ops: int) -> dict:
+    lat, errors = [], 0
+    n = len(exprs)
+    clock = time.perf_counter_ns
+    t0 = clock()
+    for i in range(ops):
+        e = exprs[i % n]
+        s = clock()
+        try:
+            fn(e)
+        except Exception:
+            errors += 1
+        lat.append(clock() - s)
+    total = clock() - t0
+    lat.sort()
+
+    # حافظه در یک دور جدا (tracemalloc خودش کند است)
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    for i in range(min(ops, 1000)):
+        try:
+            fn(exprs[i % n])
+        except Exception:
+            pass
+    cur, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": round(ops / (total / 1e9), 1),
+        "p50_us": round(_percentile(lat, 0.50) / 1e3, 3),
+        "p99_us": round(_percentile(lat, 0.99) / 1e3, 3),
+        "errors": errors,
+        "alloc_peak_bytes": peak - base,
+        "alloc_retained_bytes": cur - base,
+    }
+
+def _git_rev():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(ops: int, files=ENGINE_FILES) -> dict:
+    sys.path.insert(0, HERE)
+    results = {}
+    for name in files:
+        fn = load_engine(os.path.join(HERE, name))
+        if fn is None:
+            continue        # مثلاً calc02 هنوز ارزیاب ندارد
+        results[name] = {cat: bench(fn, exprs, ops) for cat, exprs in CORPUS.items()}
+    return {
+        "commit": _git_rev(),
+        "python": platform.python_version(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "ops": ops,
+        "results": results,
+    }
+
+# ----------------------- گزارش -----------------------
+def print_report(report, baseline=None):
+    print(f"{'engine':<10} {'corpus':<9} {'ops/s':>11} {'p50 µs':>8} {'p99 µs':>8} "
+          f"{'err':>5} {'peak B':>8}" + ("  vs base" if baseline else ""))
+    for eng, cats in report["results"].items():
+        for cat, r in cats.items():
+            line = (f"{eng:<10} {cat:<9} {r['ops_per_sec']:>11,.0f} {r['p50_us']:>8.2f} "
+                    f"{r['p99_us']:>8.2f} {r['errors']:>5} {r['alloc_peak_bytes']:>8}")
+            old = (baseline or {}).get("results", {}).get(eng, {}).get(cat)
+            if old:
+                line += f"  {r['ops_per_sec'] / old['ops_per_sec']:>6.2f}x"
+            print(line)
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="بنچمارک موتورهای ارزیابی")
+    p.add_argument("--ops", type=int, default=20000, help="تعداد ارزیابی برای هر دسته")
+    p.add_argument("--out", help="ذخیره‌ی نتایج به صورت JSON")
+    p.add_argument("--compare", help="فایل JSON قبلی برای مقایسه")
+    args = p.parse_args(argv)
+
+    report = run(args.ops)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ارزیاب خط فرمان (بدون Qt) – همان safe_eval رابط گرافیکی
+# هر خط ورودی یک عبارت است و نتیجه‌ی هر خط در همان ترتیب چاپ می‌شود.
+#
+#   cd Calc
+#   python -m calc_cli exprs.txt
+#   cat exprs.txt | python -m calc_cli --jobs 4
+
+import sys, argparse
+from collections import deque
+from itertools import islice
+
+from calc_engine import safe_eval, fmt, MODES, FLOAT, DECIMAL_PREC
+
+def eval_line(line: str, mode: str = FLOAT, precision: int = DECIMAL_PREC) -> str:
+    """یک خط → متن خروجی؛ خط خالی همان خالی می‌ماند"""
+    expr = line.strip()
+    if not expr:
+        return ""
+    try:
+        return fmt(safe_eval(expr, None, mode, precision))
+    except Exception as e:
+        return f"error: {e}"
+
+def eval_chunk(lines: list[str], mode: str = FLOAT, precision: int = DECIMAL_PREC) -> str:
+    """یک تکه از خطوط (در پروسه‌ی کارگر اجرا می‌شود)"""
+    return "".join(eval_line(line, mode, precision) + "\n" for line in lines)
+
+def _chunks(stream, size: int):
+    while True:
+        chunk = list(islice(stream, size))
+        if not chunk:
+            return
+        yield chunk
+
+def run(stream, out, jobs: int = 1, chunk_size: int = 1000,
+        mode: str = FLOAT, precision: int = DECIMAL_PREC):
+    """خواندن جریانی ورودی و نوشتن خروجی به ترتیب ورودی
+
+    با jobs > 1 تکه‌ها بین پروسه‌ها پخش می‌شوند؛ تعداد تکه‌های در جریان
+    محدود است تا مصرف حافظه مستقل از اندازه‌ی فایل بماند.
+    """
+    if jobs <= 1:
+        for chunk in _chunks(stream, chunk_size):
+            out.write(eval_chunk(chunk, mode, precision))
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        for chunk in _chunks(stream, chunk_size):
+            pending.append(pool.submit(eval_chunk, chunk, mode, precision))
+            if len(pending) >= jobs * 2:
+                out.write(pending.popleft().result())
+        while pending:
+            out.write(pending.popleft().result())
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="calc_cli", description="ارزیابی خط‌به‌خط عبارت‌ها")
+    p.add_argument("file", nargs="?", default="-", help="فایل ورودی (پیش‌فرض: stdin)")
+    p.add_argument("--jobs", "-j", type=int, default=1, help="تعداد پروسه‌های کارگر")
+    p.add_argument("--chunk", type=int, default=1000, help="تعداد خط در هر تکه")
+    p.add_argument("--mode", choices=MODES, default=FLOAT, help="حالت عددی: float، exact (کسر دقیق) یا decimal")
+    p.add_argument("--precision", type=int, default=DECIMAL_PREC, help="تعداد رقم در حالت decimal")
+    args = p.parse_args(argv)
+    if args.chunk < 1:
+        p.error("--chunk باید دست‌کم 1 باشد")
+    if args.precision < 1:
+        p.error("--precision باید دست‌کم 1 باشد")
+
+    if args.file == "-":
+        run(sys.stdin, sys.stdout, args.jobs, args.chunk, args.mode, args.precision)
+    else:
+        with open(args.file, encoding="utf-8") as f:
+            run(f, sys.stdout, args.jobs, args.chunk, args.mode, args.precision)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# حالت داده: آمار یک ستون عدد از فایل یا کلیپ‌بورد (بدون Qt)
+# ورودی تکه‌به‌تکه خوانده و با NumPy پارس می‌شود؛ هر تکه یک ColumnStats کوچک
+# می‌سازد که با merge در مجموع ادغام می‌شود (میانگین/واریانس با روش Chan).
+# صدک‌ها: تا EXACT_LIMIT مقدار دقیق (آرایه‌ی float64 فشرده)، بیش از آن از یک
+# هیستوگرام لگاریتمی با خطای نسبی حداکثر ALPHA – حافظه مستقل از اندازه‌ی فایل است.
+#
+#   python -m calc_data numbers.txt [--column 2]
+
+import io, os, math, sys, argparse
+
+import numpy as np
+
+CHUNK_BYTES = 1 << 20           # اندازه‌ی هر تکه‌ی خواندن
+EXACT_LIMIT = 1_000_000         # تا این تعداد، صدک‌ها دقیق‌اند (۸ مگابایت)
+ALPHA = 0.001                   # خطای نسبی صدک‌ها پس از عبور از EXACT_LIMIT
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+_SEP = str.maketrans(",;", "  ")     # جداکننده‌ها → فاصله، بعد str.split
+_LOG_GAMMA = math.log((1 + ALPHA) / (1 - ALPHA))
+_NEG_OFFSET = 1 << 40           # کلید سطل‌های منفی: -(OFFSET + i)
+_NEG_KEYS = -(1 << 39)
+
+# ----------------------- پارس -----------------------
+def parse_chunk(text: str, column: int | None = None):
+    """متن → (آرایه‌ی float64، تعداد توکن‌های نامعتبر)
+
+    بدون column همه‌ی توکن‌ها عددند؛ با column (از صفر) فقط آن ستون هر خط.
+    """
+    if column is None:
+        tokens = text.translate(_SEP).split()
+    else:
+        tokens = []
+        for line in text.splitlines():
+            fields = line.translate(_SEP).split()
+            if len(fields) > column:
+                tokens.append(fields[column])
+    try:
+        return np.array(tokens, dtype=np.float64), 0
+    except ValueError:                           # سرستون یا خانه‌ی غیرعددی: مسیر کند
+        good = []
+        for t in tokens:
+            try:
+                good.append(float(t))
+            except ValueError:
+                pass
+        return np.array(good, dtype=np.float64), len(tokens) - len(good)
+
+def iter_text_chunks(f, chunk_bytes: int = CHUNK_BYTES):
+    """تکه‌های متن که همیشه روی مرز خط بریده می‌شوند؛ (متن، بایت‌های خوانده‌شده)"""
+    rest, done = b"", 0
+    while True:
+        block = f.read(chunk_bytes)
+        if isinstance(block, str):
+            block = block.encode("utf-8")
+        if not block:
+            break
+        done += len(block)
+        block = rest + block
+        cut = block.rfind(b"\n") + 1
+        if cut == 0:
+            rest = block
+            continue
+        rest = block[cut:]
+        yield block[:cut].decode("utf-8", "replace"), done
+    if rest:
+        yield rest.decode("utf-8", "replace"), done
+
+# ----------------------- آمار ادغام‌پذیر -----------------------
+class ColumnStats:
+    def __init__(self):
+        self.n = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0                # مجموع مربع انحراف از میانگین
+        self.min = math.inf
+        self.max = -math.inf
+        self.skipped = 0             # توکن‌های غیرعددی
+        self.exact = []              # تکه‌های دقیق تا EXACT_LIMIT؛ بعد None
+        self.buckets = {}            # اندیس لگاریتمی علامت‌دار → تعداد
+        self.zeros = 0
+
+    def add(self, values):
+        """افزودن یک آرایه (nan کنار گذاشته می‌شود)"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size:
+            part = ColumnStats()
+            part.n = int(values.size)
+            part.total = float(values.sum())
+            part.mean = part.total / part.n
+            part.m2 = float(((values - part.mean) ** 2).sum())
+            part.min, part.max = float(values.min()), float(values.max())
+            part.exact = [values]
+            part._bucket(values)
+            self.merge(part)
+
+    def _bucket(self, values):
+        nz = values[values != 0]
+        self.zeros += int(values.size - nz.size)
+        if not nz.size:
+            return
+        with np.errstate(all="ignore"):
+            idx = np.ceil(np.log(np.abs(nz)) / _LOG_GAMMA)
+        idx = np.where(np.isfinite(idx), idx, 0).astype(np.int64)
+        keys, counts = np.unique(np.where(nz > 0, idx, -idx - _NEG_OFFSET), return_counts=True)
+        b = self.buckets
+        for k, c in zip(keys.tolist(), counts.tolist()):
+            b[k] = b.get(k, 0) + c
+
+    def merge(self, other: "ColumnStats"):
+        """ادغام آمار یک تکه‌ی دیگر (ترتیب تکه‌ها مهم نیست)"""
+        if not other.n:
+            self.skipped += other.skipped
+            return
+        n = self.n + other.n
+        d = other.mean - self.mean
+        self.mean += d * other.n / n
+        self.m2 += other.m2 + d * d * self.n * other.n / n
+        self.n = n
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.skipped += other.skipped
+        self.zeros += other.zeros
+        for k, c in other.buckets.items():
+            self.buckets[k] = self.buckets.get(k, 0) + c
+        if self.exact is not None and other.exact is not None and n <= EXACT_LIMIT:
+            self.exact.extend(other.exact)
+        else:
+            self.exact = None        # از اینجا به بعد فقط هیستوگرام
+
+    @property
+    def stdev(self) -> float:
+        """انحراف معیار نمونه"""
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def percentile(self, q: float) -> float:
+        if not self.n:
+            return math.nan
+        if self.exact is not None:
+            if len(self.exact) > 1:
+                self.exact = [np.concatenate(self.exact)]
+            return float(np.percentile(self.exact[0], q))
+        return self._approx(q)
+
+    def _approx(self, q: float) -> float:
+        rank = q / 100 * (self.n - 1)
+        b = self.buckets
+        neg = sorted(k for k in b if k < _NEG_KEYS)        # منفی‌ها، بزرگ‌ترین قدر اول
+        pos = sorted(k for k in b if k >= _NEG_KEYS)
+        seen, v = 0, self.max
+        for k in neg:
+            seen += b[k]
+            if seen > rank:
+                v = -self._center(-k - _NEG_OFFSET)
+                break
+        else:
+            seen += self.zeros
+            if seen > rank:
+                v = 0.0
+            else:
+                for k in pos:
+                    seen += b[k]
+                    if seen > rank:
+                        v = self._center(k)
+                        break
+        return min(max(v, self.min), self.max)
+
+    @staticmethod
+    def _center(i: int) -> float:
+        """نماینده‌ی سطل i یعنی بازه‌ی (γ^(i-1), γ^i]"""
+        return 2 * math.exp(i * _LOG_GAMMA) / (1 + math.exp(_LOG_GAMMA))
+
+    def summary(self) -> dict:
+        out = {"count": self.n, "sum": self.total, "mean": self.mean if self.n else math.nan,
+               "min": self.min if self.n else math.nan, "max": self.max if self.n else math.nan,
+               "stdev": self.stdev}
+        for q in PERCENTILES:
+            out[f"p{q}"] = self.percentile(q)
+        return out
+
+# ----------------------- بارگذاری جریانی -----------------------
+def load_stream(f, size: int | None = None, column: int | None = None,
+                progress=None, cancelled=None) -> ColumnStats:
+    """خواندن تکه‌به‌تکه از شیء فایل؛ progress(0..1) و cancelled() اختیاری‌اند"""
+    stats = ColumnStats()
+    for text, done in iter_text_chunks(f):
+        values, bad = parse_chunk(text, column)
+        stats.add(values)
+        stats.skipped += bad
+        if progress is not None and size:
+            progress(min(1.0, done / size))
+        if cancelled is not None and cancelled():
+            break
+    return stats
+
+def load_file(path: str, column: int | None = None, progress=None, cancelled=None) -> ColumnStats:
+    with open(path, "rb") as f:
+        return load_stream(f, os.path.getsize(path), column, progress, cancelled)
+
+def load_text(text: str, column: int | None = None, progress=None, cancelled=None) -> ColumnStats:
+    data = text.encode("utf-8")
+    return load_stream(io.BytesIO(data), len(data), column, progress, cancelled)
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="calc_data", description="آمار یک ستون عدد")
+    p.add_argument("file", nargs="?", default="-", help="فایل ورودی (- = stdin)")
+    p.add_argument("--column", "-c", type=int, help="شماره‌ی ستون (از صفر)")
+    args = p.parse_args(argv)
+    if args.file == "-":
+        stats = load_stream(sys.stdin.buffer, column=args.column)
+    else:
+        stats = load_file(args.file, args.column)
+    for k, v in stats.summary().items():
+        print(f"{k:<6} {v:.12g}" if isinstance(v, float) else f"{k:<6} {v}")
+    if stats.skipped:
+        print(f"skipped {stats.skipped}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1520 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# موتور محاسبه‌ی ماشین‌حساب – بدون وابستگی به Qt
+# عبارت یک بار توکن‌بندی و پارس می‌شود، به درختی از closureها کامپایل می‌شود
+# و نتیجه‌ی کامپایل در یک کش LRU (کلید: متن نرمال‌شده) نگه داشته می‌شود.
+# قالب‌بندی اعداد، مموری و تاریخچه هم اینجاست؛ فایل‌های رابط فقط پوسته‌اند.
+# هیچ import سنگینی در سطح ماژول نیست (numpy و ذخیره‌ی دیسکی تنبل‌اند).
+
+import math, re, time, operator, importlib
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+
+# ----------------------- بردار و ماتریس (NumPy در اولین استفاده) -----------------------
+# [1,2,3] و [[1,2],[3,4]] آرایه‌ی float64 می‌سازند؛ + - * / ** عنصربه‌عنصرند.
+# نتیجه‌ی صفربعدی به عدد معمولی پایتون برگردانده می‌شود.
+def _scalar(v):
+    return v.item() if getattr(v, "ndim", None) == 0 else v
+
+def _array(items):
+    import numpy as np
+    try:
+        return np.array(items, dtype=np.float64)
+    except ValueError:
+        raise ValueError("ردیف‌های ماتریس هم‌اندازه نیستند") from None
+
+def _dot(a, b):
+    import numpy as np
+    return _scalar(np.dot(a, b))
+
+def _inv(a):
+    import numpy as np
+    return np.linalg.inv(a)
+
+def _det(a):
+    import numpy as np
+    return _scalar(np.linalg.det(a))
+
+def _sum(a):
+    import numpy as np
+    return _scalar(np.sum(a))
+
+def _mean(a):
+    import numpy as np
+    return _scalar(np.mean(a))
+
+def _norm(a):
+    import numpy as np
+    return _scalar(np.linalg.norm(a))
+
+# ----------------------- توابع و الگوی مجاز -----------------------
+# فقط توابع و ثابت‌های مجاز را معرفی می‌کنیم
+ALLOWED_FUNCS = {
+    "sqrt": math.sqrt, "sin": math.sin, "cos": math.cos, "tan": math.tan,
+    "asin": math.asin, "acos": math.acos, "atan": math.atan,
+    "log": math.log10, "ln": math.log, "abs": abs, "round": round,
+    "floor": math.floor, "ceil": math.ceil,
+    "dot": _dot, "inv": _inv, "det": _det, "sum": _sum, "mean": _mean, "norm": _norm,
+    "pi": math.pi, "e": math.e, "inf": math.inf,
+    "__registry__": True,   # نشانه: env کپی همین رجیستری است و تابع خانواده‌ها را هم می‌پذیرد
+}
+# الگوی کاراکترهای مجاز
+ALLOWED_PATTERN = re.compile(r"^[0-9\s\+\-\*/\.\%\^\(\)\[\]\,a-zA-Z]+$")
+
+# ----------------------- رجیستری توابع (خانواده‌های تنبل) -----------------------
+# خانواده‌های توابع فقط با نام ماژول و نام توابعشان ثبت می‌شوند؛ ماژول اولین
+# بار که عبارتی یکی از آن نام‌ها را صدا بزند import می‌شود، پس تعداد توابع
+# روی زمان شروع اثری ندارد. فراداده‌ی هر تابع (FuncInfo) برای کامپایلر:
+#   pure   : تا کردن ثابت و اشتراک زیرعبارت تکراری مجاز است (rand() نه)
+#   vector : آرایه‌ی NumPy را مستقیم می‌پذیرد؛ وگرنه batch_eval آن را با np.vectorize صدا می‌زند
+#   cost   : فراخوانی تکراریِ ارزان‌تر از MEMO_MIN_COST خانه‌ی memo نمی‌گیرد
+COST_CHEAP, COST_NORMAL, COST_HEAVY = 1, 10, 1000
+MEMO_MIN_COST = 2
+
+class FuncInfo:
+    __slots__ = ("fn", "pure", "vector", "cost")
+
+    def __init__(self, fn, pure=True, vector=False, cost=COST_NORMAL):
+        self.fn, self.pure, self.vector, self.cost = fn, pure, vector, cost
+
+_CHEAP = {"abs", "round", "floor", "ceil"}
+# توابع math که فقط عدد می‌پذیرند؛ با آرایه (مثل sqrt([4, 9])) معادل NumPy آن‌ها صدا زده می‌شود
+_SCALAR_MATH = {"sqrt", "sin", "cos", "tan", "asin", "acos", "atan", "log", "ln",
+                "round", "floor", "ceil"}
+_INFO = {n: FuncInfo(f, vector=n not in _SCALAR_MATH,
+                     cost=COST_CHEAP if n in _CHEAP else COST_NORMAL)
+         for n, f in ALLOWED_FUNCS.items() if callable(f)}
+
+# خانواده → (ماژول، نام توابع)
+FAMILIES = {
+    "stats": ("calc_funcs.stats", ("median", "mode", "stdev", "pstdev", "variance",
+                                   "pvariance", "gmean", "hmean")),
+    "special": ("calc_funcs.special", ("gamma", "lgamma", "erf", "erfc", "beta",
+                                       "fact", "comb", "perm")),
+    "finance": ("calc_funcs.finance", ("fv", "pv", "pmt", "nper", "npv", "irr")),
+    "bits": ("calc_funcs.bits", ("band", "bor", "bxor", "bnot", "shl", "shr", "popcount")),
+    "random": ("calc_funcs.rand", ("rand", "randint")),
+}
+_FAMILY_OF = {n: fam for fam, (_, names) in FAMILIES.items() for n in names}
+
+def register_family(family: str, module: str, names):
+    """ثبت یک خانواده‌ی تازه؛ ماژول باید FUNCS = {نام: FuncInfo} داشته باشد"""
+    names = tuple(names)
+    taken = [n for n in names if n in ALLOWED_FUNCS or _FAMILY_OF.get(n, family) != family]
+    if taken:
+        raise ValueError(f"نام تکراری: {', '.join(taken)}")
+    FAMILIES[family] = (module, names)
+    for n in names:
+        _FAMILY_OF[n] = family
+
+def _load_family(family: str):
+    module, names = FAMILIES[family]
+    funcs = importlib.import_module(module).FUNCS
+    for n in names:
+        _INFO[n] = funcs[n]
+        ALLOWED_FUNCS[n] = funcs[n].fn
+
+def function_info(name: str):
+    """فراداده‌ی تابع (خانواده‌اش در صورت نیاز بارگذاری می‌شود)؛ None اگر تابع نیست"""
+    info = _INFO.get(name)
+    if info is None and name in _FAMILY_OF:
+        _load_family(_FAMILY_OF[name])
+        info = _INFO.get(name)
+    return info
+
+def is_function(name: str) -> bool:
+    """نام تابع/ثابت مجاز (بدون import خانواده)"""
+    return name in ALLOWED_FUNCS or name in _FAMILY_OF or name in CALCULUS_FORMS
+
+# اندازه‌ی کش عبارت‌های کامپایل‌شده
+CACHE_SIZE = 1024
+# سقف اندازه‌ی نتیجه‌ی توان صحیح (بیت) – جلوی عبارت‌هایی مثل 9^9^9 را می‌گیرد
+MAX_POW_BITS = 1_000_000
+
+def normalize(expr: str) -> str:
+    """تبدیل ورودی کاربر به چیزی که پارسر بفهمد"""
+    return (expr.replace("√", "sqrt")
+                .replace("^", "**"))
+
+# ----------------------- توکن‌بندی -----------------------
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<name>[A-Za-z]\w*)
+      | (?P<op>\*\*|//|[-+*/%(),\[\]])
+    )""", re.VERBOSE)
+
+def tokenize(expr: str) -> list[tuple[str, str]]:
+    """تبدیل متن به فهرست (نوع، متن) – هر کاراکتر ناشناخته خطاست"""
+    tokens, pos, end = [], 0, len(expr)
+    while pos < end:
+        m = _TOKEN.match(expr, pos)
+        if not m or m.end() == pos:
+            if expr[pos:].strip() == "":
+                break
+            raise ValueError(f"کاراکتر نامعتبر: {expr[pos:pos + 1]!r}")
+        kind = m.lastgroup
+        tokens.append((kind, m.group(kind)))
+        pos = m.end()
+    return tokens
+
+# ----------------------- پارسر (recursive descent) -----------------------
+# گره‌های درخت tuple هستند:
+#   ("num", v) یا ("num", v, متن) برای لیترال اعشاری • ("name", n) • ("neg", a) • ("pos", a)
+#   ("bin", op, a, b) • ("call", n, (args...)) • ("list", (items...))
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.i = 0
+
+    def peek(self):
+        return self.tokens[self.i] if self.i < len(self.tokens) else (None, None)
+
+    def take(self, text=None):
+        kind, tok = self.peek()
+        if kind is None or (text is not None and tok != text):
+            raise ValueError(f"عبارت ناقص/نامعتبر (انتظار {text or 'عبارت'})")
+        self.i += 1
+        return kind, tok
+
+    def parse(self):
+        node = self.expr()
+        if self.i != len(self.tokens):
+            raise ValueError(f"توکن غیرمنتظره: {self.tokens[self.i][1]!r}")
+        return node
+
+    # expr := term (('+'|'-') term)*
+    def expr(self):
+        node = self.term()
+        while self.peek()[1] in ("+", "-"):
+            _, op = self.take()
+            node = ("bin", op, node, self.term())
+        return node
+
+    # term := factor (('*'|'/'|'//'|'%') factor)*
+    def term(self):
+        node = self.factor()
+        while self.peek()[1] in ("*", "/", "//", "%"):
+            _, op = self.take()
+            node = ("bin", op, node, self.factor())
+        return node
+
+    # factor := ('+'|'-') factor | power
+    def factor(self):
+        tok = self.peek()[1]
+        if tok == "-":
+            self.take()
+            return ("neg", self.factor())
+        if tok == "+":
+            self.take()
+            return ("pos", self.factor())
+        return self.power()
+
+    # power := atom ('**' factor)?   (راست‌به‌چپ، مثل پایتون)
+    def power(self):
+        node = self.atom()
+        if self.peek()[1] == "**":
+            self.take()
+            node = ("bin", "**", node, self.factor())
+        return node
+
+    # atom := NUMBER | NAME | NAME '(' args ')' | '(' expr ')' | '[' args ']'
+    def atom(self):
+        kind, tok = self.take()
+        if kind == "num":
+            if any(ch in tok for ch in ".eE"):
+                return ("num", float(tok), tok)     # متن برای حالت‌های دقیق/دهدهی می‌ماند
+            return ("num", int(tok))
+        if kind == "name":
+            if self.peek()[1] != "(":
+                return ("name", tok)
+            self.take("(")
+            args = []
+            if self.peek()[1] != ")":
+                args.append(self.expr())
+                while self.peek()[1] == ",":
+                    self.take()
+                    args.append(self.expr())
+            self.take(")")
+            return ("call", tok, tuple(args))
+        if tok == "(":
+            node = self.expr()
+            self.take(")")
+            return node
+        if tok == "[":
+            items = [self.expr()]
+            while self.peek()[1] == ",":
+                self.take()
+                items.append(self.expr())
+            self.take("]")
+            return ("list", tuple(items))
+        raise ValueError(f"توکن غیرمنتظره: {tok!r}")
+
+def parse(expr: str) -> tuple:
+    """متن نرمال‌شده → درخت عبارت"""
+    return _Parser(tokenize(expr)).parse()
+
+# ----------------------- کامپایل به closure -----------------------
+def _pow(a, b):
+    """توان با پیش‌بررسی اندازه‌ی نتیجه (فقط برای اعداد صحیح؛ float خودش سرریز می‌دهد)"""
+    if type(a) is int and type(b) is int and b > 0 and abs(a) > 1:
+        if b * math.log2(abs(a)) > MAX_POW_BITS:
+            raise OverflowError("نتیجه‌ی توان بیش از حد بزرگ است")
+    return a ** b
+
+_BINOPS = {
+    "+": operator.add, "-": operator.sub, "*": operator.mul,
+    "/": operator.truediv, "//": operator.floordiv, "%": operator.mod,
+    "**": _pow,
+}
+
+# ----------------------- حالت‌های عددی: دقیق و Decimal -----------------------
+# FLOAT (پیش‌فرض) همان مسیر قبلی است و هیچ هزینه‌ی اضافه‌ای ندارد.
+# EXACT   : عدد صحیح و کسرها دقیق می‌مانند (1/3 → Fraction)؛ فقط وقتی تابعی
+#           مثل sin یا آرایه وارد شود نتیجه float می‌شود.
+# DECIMAL : ممیز شناور دهدهی با precision رقم؛ sqrt/ln/log و pi/e با همان دقت،
+#           بقیه‌ی توابع با float.
+# در این دو حالت تا کردن ثابت‌ها (که با float حساب می‌کند) انجام نمی‌شود.
+FLOAT, EXACT, DECIMAL = "float", "exact", "decimal"
+MODES = (FLOAT, EXACT, DECIMAL)
+DECIMAL_PREC = 50
+
+def _has_array(a, b):
+    return hasattr(a, "ndim") or hasattr(b, "ndim")
+
+@lru_cache(maxsize=None)
+def _exact_ops():
+    """(عملگرها، تبدیل متن لیترال اعشاری) برای حالت EXACT"""
+    from fractions import Fraction
+    rational = (int, Fraction)
+
+    def norm(v):
+        return v.numerator if type(v) is Fraction and v.denominator == 1 else v
+
+    def wrap(op):
+        def g(a, b):
+            if _has_array(a, b):        # کسر با آرایه → float، مثل حالت عادی
+                return op(float(a) if type(a) is Fraction else a,
+                          float(b) if type(b) is Fraction else b)
+            return norm(op(a, b))
+        return g
+
+    def div(a, b):
+        if type(a) in rational and type(b) in rational:
+            if not b:
+                raise ZeroDivisionError("division by zero")
+            return norm(Fraction(a) / b)
+        return wrap(operator.truediv)(a, b)
+
+    def power(a, b):
+        if type(b) is int and type(a) in rational and (type(a) is Fraction or b < 0):
+            a = Fraction(a)
+            bits = max(a.numerator.bit_length(), a.denominator.bit_length())
+            if abs(b) * bits > MAX_POW_BITS:
+                raise OverflowError("نتیجه‌ی توان بیش از حد بزرگ است")
+            return norm(a ** b)
+        return wrap(_pow)(a, b)
+
+    ops = {op: wrap(f) for op, f in _BINOPS.items()}
+    ops["/"], ops["**"] = div, power
+    return ops, lambda text: norm(Fraction(text))     # 0.1 → 1/10، نه کسر دودویی
+
+@lru_cache(maxsize=None)
+def _decimal_ops():
+    """(عملگرها، تبدیل متن لیترال اعشاری) برای حالت DECIMAL؛ دقت از context جاری"""
+    from decimal import Decimal
+
+    def dec(v):
+        t = type(v)
+        if t is Decimal:
+            return v
+        return Decimal(v) if t is int else Decimal(repr(float(v)))
+
+    def wrap(op, ints=True):
+        def g(a, b):
+            if ints and type(a) is int and type(b) is int:
+                return op(a, b)         # صحیح با صحیح دقیق می‌ماند
+            if _has_array(a, b):
+                return op(float(a) if type(a) is Decimal else a,
+                          float(b) if type(b) is Decimal else b)
+            return op(dec(a), dec(b))
+        return g
+
+    # % و // در Decimal به سمت صفر گرد می‌کنند؛ اینجا مثل پایتون (کف)
+    def mod(a, b):
+        r = a % b
+        return r + b if r and (r < 0) != (b < 0) else r
+
+    def floordiv(a, b):
+        if type(a) is int and type(b) is int:
+            return a // b               # wrap صحیح‌ها را مستقیم اینجا می‌فرستد
+        return (a - mod(a, b)) / b
+
+    def power(a, b):
+        if type(a) is int and type(b) is int and b >= 0:
+            return _pow(a, b)
+        return wrap(operator.pow, False)(a, b)
+
+    ops = {op: wrap(f) for op, f in _BINOPS.items()}
+    ops["/"] = wrap(operator.truediv, False)
+    ops["%"], ops["//"], ops["**"] = wrap(mod), wrap(floordiv), power
+    return ops, Decimal
+
+_MODE_OPS = {FLOAT: lambda: (_BINOPS, None), EXACT: _exact_ops, DECIMAL: _decimal_ops}
+
+@lru_cache(maxsize=8)
+def _decimal_env(precision: int) -> dict:
+    """توابع مجاز با جذر، لگاریتم و pi/e دهدهی با precision رقم"""
+    from decimal import Decimal, localcontext
+
+    def dec(x):
+        t = type(x)
+        if t is Decimal:
+            return x
+        return Decimal(x) if t is int else Decimal(repr(float(x)))
+
+    with localcontext() as ctx:
+        ctx.prec = precision + 5
+        pi = _decimal_pi()
+        e = Decimal(1).exp()
+    env = dict(ALLOWED_FUNCS)
+    with localcontext() as ctx:
+        ctx.prec = precision
+        env.update(sqrt=lambda x: dec(x).sqrt(), ln=lambda x: dec(x).ln(),
+                   log=lambda x: dec(x).log10(), pi=+pi, e=+e)
+    return env
+
+def _decimal_pi():
+    """pi با دقت context جاری (سری همگرای مستندات decimal)"""
+    from decimal import Decimal, getcontext
+    getcontext().prec += 2
+    three = Decimal(3)
+    lasts, t, s, n, na, d, da = 0, three, 3, 1, 0, 0, 24
+    while s != lasts:
+        lasts = s
+        n, na = n + na, na + 8
+        d, da = d + da, da + 32
+        t = (t * n) / d
+        s += t
+    getcontext().prec -= 2
+    return +s
+
+_VECTORIZED = {}            # نام → np.vectorize تابع غیر برداری (برای env برداری)
+
+def _nan_on_error(fn):
+    """نسخه‌ی اسکالر برای np.vectorize: خطای یک عنصر (مثل fact(-1)) فقط همان عنصر را nan می‌کند"""
+    def g(*args):
+        try:
+            return float(fn(*args))
+        except (ArithmeticError, ValueError):
+            return math.nan
+    return g
+
+def _load(env, name):
+    try:
+        return env[name]
+    except KeyError:
+        pass
+    # تابعی از خانواده‌ای که در این env (مثلاً کپی یا env برداری) هنوز نیست؛
+    # فقط envهای رجیستری آن را می‌گیرند و خود env هرگز تغییر نمی‌کند
+    info = function_info(name) if "__registry__" in env else None
+    if info is None:
+        raise NameError(f"name {name!r} is not defined")
+    if "__vector__" not in env or info.vector:
+        return info.fn
+    fn = _VECTORIZED.get(name)
+    if fn is None:
+        import numpy as np
+        fn = _VECTORIZED[name] = np.vectorize(_nan_on_error(info.fn), otypes=[np.float64])
+    return fn
+
+# ----------------------- بهینه‌سازی: تا کردن ثابت‌ها -----------------------
+# فقط توابع pure و ارزان‌تر از COST_HEAVY تا می‌شوند؛ ثابت‌ها (pi, e) هم مقدار
+# عددی می‌گیرند. نام‌های تاشده در used جمع می‌شوند تا compile_expr بداند شکل
+# تاشده برای کدام env درست است.
+CONSTANTS = {n: v for n, v in ALLOWED_FUNCS.items()
+             if not callable(v) and not n.startswith("__")}
+
+def _try_fold(fn, *args):
+    """محاسبه در زمان کامپایل؛ اگر خطا داد (مثل 1/0) همان گره می‌ماند تا خطا در اجرا رخ دهد"""
+    try:
+        v = fn(*args)
+    except Exception:
+        return None
+    return ("num", v) if type(v) in (int, float) else None
+
+def fold(node, used=None):
+    """زیردرخت‌های بدون متغیر (از جمله فراخوانی توابع خالص) → یک عدد"""
+    if used is None:
+        used = set()
+    kind = node[0]
+    if kind == "num":
+        return node
+    if kind == "name":
+        v = CONSTANTS.get(node[1])
+        if v is None:
+            return node
+        used.add(node[1])
+        return ("num", v)
+    if kind in ("neg", "pos"):
+        a = fold(node[1], used)
+        if a[0] == "num":
+            folded = _try_fold(operator.neg if kind == "neg" else operator.pos, a[1])
+            if folded:
+                return folded
+        return (kind, a)
+    if kind == "bin":
+        a, b = fold(node[2], used), fold(node[3], used)
+        if a[0] == "num" and b[0] == "num":
+            folded = _try_fold(_BINOPS[node[1]], a[1], b[1])
+            if folded:
+                return folded
+        return ("bin", node[1], a, b)
+    if kind == "call":
+        args = tuple(fold(a, used) for a in node[2])
+        info = function_info(node[1])
+        if (info is not None and info.pure and info.cost < COST_HEAVY
+                and all(a[0] == "num" for a in args)):
+            folded = _try_fold(info.fn, *[a[1] for a in args])
+            if folded:
+                used.add(node[1])
+                return folded
+        return ("call", node[1], args)
+    if kind == "list":
+        return ("list", tuple(fold(a, used) for a in node[1]))
+    raise ValueError(f"گره ناشناخته: {kind!r}")
+
+# ----------------------- بهینه‌سازی: زیرعبارت‌های تکراری -----------------------
+def _keys(node, keys, counts):
+    """کلید ساختاری هر گره (نوع عدد هم جزو کلید است: 1 ≠ 1.0) و تعداد تکرارش"""
+    kind = node[0]
+    if kind == "num":
+        k = ("num", type(node[1])) + node[1:]      # 1.0 و 1.00000000000000000001 هم جدا
+    elif kind == "name":
+        k = node
+    elif kind in ("neg", "pos"):
+        k = (kind, _keys(node[1], keys, counts))
+    elif kind == "bin":
+        k = ("bin", node[1], _keys(node[2], keys, counts), _keys(node[3], keys, counts))
+    elif kind == "list":
+        k = ("list", tuple(_keys(a, keys, counts) for a in node[1]))
+    else:
+        k = ("call", node[1], tuple(_keys(a, keys, counts) for a in node[2]))
+        info = function_info(node[1])
+        if info is not None and not info.pure:
+            k = ("impure", id(node))        # هر فراخوانی جداست؛ هرگز مشترک نمی‌شود
+    keys[id(node)] = k
+    counts[k] = counts.get(k, 0) + 1
+    return k
+
+_UNSET = object()
+
+class _Compiler:
+    """درخت → closureهای g(env, memo)؛ زیرعبارت تکراری یک خانه در memo می‌گیرد"""
+    def __init__(self, root, mode=FLOAT):
+        self.ops, self.literal = _MODE_OPS[mode]()
+        self.keys, self.counts = {}, {}
+        _keys(root, self.keys, self.counts)
+        self.slots = {}
+        self.arrays = False             # لیترال آرایه دارد؛ compile_node آن را زیر np.errstate می‌برد
+        self.root = self.build(root)
+
+    def build(self, node):
+        g = self._build(node)
+        k = self.keys[id(node)]
+        if node[0] in ("num", "name") or self.counts[k] < 2:
+            return g
+        if node[0] == "call":
+            info = function_info(node[1])
+            if info is not None and info.cost < MEMO_MIN_COST:
+                return g                    # خانه‌ی memo از خود فراخوانی گران‌تر است
+        i = self.slots.setdefault(k, len(self.slots))
+
+        def cached(env, memo):
+            v = memo[i]
+            if v is _UNSET:
+                v = memo[i] = g(env, memo)
+            return v
+        return cached
+
+    def _build(self, node):
+        kind = node[0]
+        if kind == "num":
+            v = node[1]
+            if self.literal is not None and type(v) is float:
+                v = self.literal(node[2] if len(node) > 2 else repr(v))   # از متن، نه از float
+            return lambda env, memo: v
+        if kind == "name":
+            name = node[1]
+            return lambda env, memo: _load(env, name)
+        if kind == "neg":
+            f = self.build(node[1])
+            return lambda env, memo: -f(env, memo)
+        if kind == "pos":
+            f = self.build(node[1])
+            return lambda env, memo: +f(env, memo)
+        if kind == "bin":
+            op = self.ops[node[1]]
+            a, b = self.build(node[2]), self.build(node[3])
+            return lambda env, memo: op(a(env, memo), b(env, memo))
+        if kind == "call":
+            name = node[1]
+            if name in CALCULUS_FORMS:
+                return self._calculus(node)
+            fs = [self.build(a) for a in node[2]]
+            if name in _SCALAR_MATH:
+                return self._scalar_math(name, fs)
+            if len(fs) == 1:
+                f = fs[0]
+                return lambda env, memo: _load(env, name)(f(env, memo))
+            return lambda env, memo: _load(env, name)(*[f(env, memo) for f in fs])
+        if kind == "list":
+            self.arrays = True
+            fs = [self.build(a) for a in node[1]]
+            return lambda env, memo: _array([f(env, memo) for f in fs])
+        raise ValueError(f"گره ناشناخته: {kind!r}")
+
+    def _scalar_math(self, name, fs):
+        """sqrt و مانند آن: عدد → تابع math؛ آرایه در env عادی → ufunc همان نام"""
+        if len(fs) == 1:
+            f = fs[0]
+
+            def g(env, memo):
+                v = f(env, memo)
+                fn = _load(env, name)
+                if type(v) is not float and hasattr(v, "ndim") and fn is ALLOWED_FUNCS.get(name):
+                    return _ufunc(name, v)
+                return fn(v)
+            return g
+
+        def g(env, memo):
+            args = [f(env, memo) for f in fs]
+            fn = _load(env, name)
+            if fn is ALLOWED_FUNCS.get(name) and any(hasattr(a, "ndim") for a in args):
+                return _ufunc(name, *args)
+            return fn(*args)
+        return g
+
+    def _calculus(self, node):
+        """integrate(f, x, a, b) / diff(f, x, at): f یک بار به تابع برداری x → f(x) کامپایل می‌شود"""
+        name, args = node[1], node[2]
+        if (len(args) != CALCULUS_FORMS[name] or args[1][0] != "name"
+                or is_function(args[1][1])):
+            usage = "integrate(f, x, a, b)" if name == "integrate" else "diff(f, x, at)"
+            raise ValueError(f"استفاده‌ی درست: {usage}")
+        var = args[1][1]
+        body = compile_node(args[0])            # همیشه float و برداری
+        outer = tuple(sorted(_free_names(args[0], set()) - {var}))
+        bounds = [self.build(a) for a in args[2:]]
+        method = gauss_kronrod if name == "integrate" else richardson_diff
+
+        def scalar(*params):
+            venv = dict(vector_funcs())
+            venv.update(zip(outer, map(float, params[len(bounds):])))
+
+            def f(xs):
+                venv[var] = xs
+                return body(venv)
+            return method(f, *map(float, params[:len(bounds)]))
+
+        def g(env, memo):
+            params = [b(env, memo) for b in bounds] + [_load(env, n) for n in outer]
+            if any(getattr(p, "ndim", 0) for p in params):
+                import numpy as np          # مثلاً کران آرایه‌ای در batch_eval یا نمودار
+                return np.vectorize(scalar, otypes=[np.float64])(*params)
+            return scalar(*params)
+        return g
+
+def _ufunc(name, *args):
+    """معادل NumPy تابع math؛ مثل batch_eval، 1/0 و sqrt(-1) بی‌صدا inf/nan می‌دهند"""
+    import numpy as np
+    with np.errstate(all="ignore"):
+        return vector_funcs()[name](*args)
+
+def compile_node(node, mode=FLOAT):
+    """درخت → تابع f(env)؛ نام‌ها هنگام اجرا از env خوانده می‌شوند"""
+    c = _Compiler(node, mode)
+    g, n = c.root, len(c.slots)
+    if c.arrays:
+        import numpy as np
+        inner = g
+
+        def g(env, memo):
+            with np.errstate(all="ignore"):     # حساب آرایه‌ای بدون RuntimeWarning روی stderr
+                return inner(env, memo)
+    if not n:
+        return lambda env: g(env, None)
+    return lambda env: g(env, [_UNSET] * n)
+
+def _folded(node):
+    """شکل تاشده فقط برای envی که همان ثابت‌ها و توابع رجیستری را دارد؛
+    env محدود (مثل {sqrt, abs}) شکل تانشده را می‌گیرد تا نام ناشناخته خطا دهد"""
+    used = set()
+    fast = compile_node(fold(node, used))
+    if not used:
+        return fast
+    plain = None
+
+    def f(env):
+        nonlocal plain
+        if "__registry__" in env or all(env.get(n, _UNSET) is ALLOWED_FUNCS.get(n) for n in used):
+            return fast(env)
+        if plain is None:
+            plain = compile_node(node)
+        return plain(env)
+    return f
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expr(expr: str, mode: str = FLOAT):
+    """کامپایل متن نرمال‌شده با کش LRU – عبارت تکراری دوباره پارس نمی‌شود
+
+    پیش از کامپایل ثابت‌ها تا می‌شوند و زیرعبارت‌های تکراری یک بار محاسبه
+    می‌شوند؛ خود شکل بهینه‌شده هم در همین کش می‌ماند.
+    """
+    validate(expr)
+    if mode == FLOAT:
+        return _folded(parse(expr))
+    if mode not in MODES:
+        raise ValueError(f"حالت عددی ناشناخته: {mode!r}")
+    return compile_node(parse(expr), mode)
+
+def validate(expr: str):
+    if "__" in expr or not ALLOWED_PATTERN.match(expr):
+        raise ValueError("عبارت نامعتبر/غیرامن")
+
+# ----------------------- ارزیابی امن -----------------------
+def _env(variables):
+    return {**ALLOWED_FUNCS, **variables} if variables else ALLOWED_FUNCS
+
+def _run(f, variables, mode, precision):
+    """اجرای تابع کامپایل‌شده در حالت EXACT یا DECIMAL"""
+    if mode != DECIMAL:
+        return f(_env(variables))
+    import decimal
+    env = _decimal_env(precision)
+    if variables:
+        env = {**env, **variables}
+    with decimal.localcontext() as ctx:
+        ctx.prec = precision
+        try:
+            return f(env)
+        except decimal.DivisionByZero:
+            raise ZeroDivisionError("division by zero") from None
+        except decimal.Overflow:
+            raise OverflowError("نتیجه بیش از حد بزرگ است") from None
+        except decimal.DecimalException:
+            raise ValueError("math domain error") from None
+
+def safe_eval(expr: str, variables=None, mode: str = FLOAT, precision: int = DECIMAL_PREC):
+    """ارزیابی امن: فقط پارسر خودمان، بدون eval؛ دیکشنری فقط با متغیر کپی می‌شود"""
+    expr = normalize((expr or "").strip())
+    if not expr:
+        return 0.0
+    if mode == FLOAT:
+        return compile_expr(expr)(_env(variables))
+    return _run(compile_expr(expr, mode), variables, mode, precision)
+
+def profiled_eval(expr: str, variables=None, mode: str = FLOAT, precision: int = DECIMAL_PREC):
+    """مثل safe_eval، به‌علاوه‌ی زمان هر مرحله: (نتیجه، {مرحله: نانوثانیه})"""
+    clock = time.perf_counter_ns
+    t0 = clock()
+    expr = normalize((expr or "").strip())
+    t1 = clock()
+    if not expr:
+        return 0.0, {"normalize": t1 - t0}
+    validate(expr)
+    t2 = clock()
+    f = compile_expr(expr) if mode == FLOAT else compile_expr(expr, mode)   # برخورد با کش تقریباً صفر است
+    t3 = clock()
+    val = f(_env(variables)) if mode == FLOAT else _run(f, variables, mode, precision)
+    t4 = clock()
+    return val, {"normalize": t1 - t0, "validate": t2 - t1, "compile": t3 - t2, "eval": t4 - t3}
+
+# ----------------------- متغیرها و کاربرگ -----------------------
+# "rate = 0.07" یک تعریف است؛ فرمول هر تعریف با نام‌هایی که می‌خواند در گراف
+# وابستگی ثبت می‌شود. تغییر یک تعریف فقط خودش و وابسته‌هایش را (به ترتیب
+# توپولوژیک) دوباره حساب می‌کند. ans همیشه نتیجه‌ی آخرین ارزیابی است.
+_ASSIGN = re.compile(r"^\s*([A-Za-z]\w*)\s*=(?!=)\s*(.*?)\s*$", re.S)
+
+def split_assignment(text: str):
+    """"name = expr" → (name, expr)؛ در غیر این صورت (None, text)"""
+    m = _ASSIGN.match(text or "")
+    return (m.group(1), m.group(2)) if m else (None, text)
+
+def _free_names(node, out):
+    """نام متغیرهایی که درخت می‌خواند (توابع و ثابت‌های مجاز جزوشان نیستند)"""
+    kind = node[0]
+    if kind == "name":
+        if not is_function(node[1]):
+            out.add(node[1])
+    elif kind in ("neg", "pos"):
+        _free_names(node[1], out)
+    elif kind == "bin":
+        _free_names(node[2], out)
+        _free_names(node[3], out)
+    elif kind == "call":
+        args = node[2]
+        if node[1] in CALCULUS_FORMS and len(args) > 1 and args[1][0] == "name":
+            out |= _free_names(args[0], set()) - {args[1][1]}      # متغیر انتگرال آزاد نیست
+            args = args[2:]
+        for a in args:
+            _free_names(a, out)
+    elif kind == "list":
+        for a in node[1]:
+            _free_names(a, out)
+    return out
+
+class Worksheet:
+    """تعریف‌های نام‌دار با بازمحاسبه‌ی افزایشی"""
+    def __init__(self):
+        self.formulas: dict[str, str] = {}      # نام → متن نرمال‌شده‌ی فرمول
+        self.deps: dict[str, set] = {}          # نام → نام‌هایی که می‌خواند
+        self.users: dict[str, set] = {}         # نام → تعریف‌هایی که آن را می‌خوانند
+        self.values: dict = {}                  # فقط متغیرهای مقداردار
+        self.errors: dict[str, str] = {}        # تعریف‌هایی که فعلاً حساب نمی‌شوند
+        self.env = dict(ALLOWED_FUNCS)          # توابع + متغیرها، برای compile_expr
+
+    def __contains__(self, name):
+        return name in self.values
+
+    def define(self, name: str, expr: str, value=_UNSET) -> list[str]:
+        """ثبت/تغییر تعریف؛ خروجی: نام‌هایی که دوباره حساب شدند (به ترتیب)
+
+        اگر value داده شود (مثلاً در پروسه‌ی کارگر حساب شده) خود تعریف دوباره
+        حساب نمی‌شود و فقط وابسته‌ها به‌روز می‌شوند.
+        """
+        if is_function(name) or "__" in name:
+            raise ValueError(f"نام رزرو شده است: {name}")
+        expr = normalize(expr.strip())
+        if not expr:
+            raise ValueError("فرمول خالی است")
+        compile_expr(expr)                      # خطای نحوی پیش از تغییر گراف
+        deps = _free_names(parse(expr), set())
+        if "ans" in deps and name != "ans":
+            # ans در تعریف، مقدار همان لحظه است؛ وگرنه با هر ارزیابی عوض می‌شد
+            ans = self.values.get("ans")
+            if hasattr(ans, "denominator") and type(ans) is not int:
+                ans = f"{ans.numerator}/{ans.denominator}"      # Fraction دقیق می‌ماند
+            elif hasattr(ans, "as_tuple"):
+                ans = str(ans)                                  # Decimal
+            elif isinstance(ans, (int, float)):
+                ans = repr(ans)
+            else:
+                raise ValueError("در تعریف فقط ans عددی قابل استفاده است")
+            expr = re.sub(r"\bans\b", f"({ans})", expr)
+            deps.discard("ans")
+        if name in deps or any(name in self._upstream(d) for d in deps):
+            raise ValueError(f"وابستگی چرخه‌ای: {name}")
+
+        for d in self.deps.get(name, ()):
+            self.users[d].discard(name)
+        for d in deps:
+            self.users.setdefault(d, set()).add(name)
+        self.deps[name] = deps
+        self.formulas[name] = expr
+        if value is not _UNSET:
+            self._store(name, value)
+            return [name] + self._recompute(self._downstream(name) - {name})
+        return self._recompute(self._downstream(name))
+
+    def set_value(self, name: str, value) -> list[str]:
+        """مقدار ثابت بدون فرمول؛ وابسته‌ها دوباره حساب می‌شوند"""
+        for d in self.deps.pop(name, ()):
+            self.users[d].discard(name)
+        self.formulas.pop(name, None)
+        self._store(name, value)
+        return [name] + self._recompute(self._downstream(name) - {name})
+
+    def remove(self, name: str) -> list[str]:
+        for d in self.deps.pop(name, ()):
+            self.users[d].discard(name)
+        self.formulas.pop(name, None)
+        self.errors.pop(name, None)
+        self.values.pop(name, None)
+        self.env.pop(name, None)
+        return self._recompute(self._downstream(name) - {name})
+
+    def _store(self, name, value):
+        self.values[name] = self.env[name] = value
+        self.errors.pop(name, None)
+
+    def _upstream(self, name) -> set:
+        seen, stack = set(), [name]
+        while stack:
+            for d in self.deps.get(stack.pop(), ()):
+                if d not in seen:
+                    seen.add(d)
+                    stack.append(d)
+        return seen
+
+    def _downstream(self, name) -> set:
+        seen, stack = {name}, [name]
+        while stack:
+            for u in self.users.get(stack.pop(), ()):
+                if u not in seen:
+                    seen.add(u)
+                    stack.append(u)
+        return seen
+
+    def _recompute(self, dirty: set) -> list[str]:
+        """فقط تعریف‌های dirty، هر کدام پس از همه‌ی پیش‌نیازهایش (الگوریتم Kahn)"""
+        dirty = {n for n in dirty if n in self.formulas}
+        waiting = {n: len(self.deps[n] & dirty) for n in dirty}
+        ready = sorted(n for n, k in waiting.items() if k == 0)
+        order = []
+        while ready:
+            n = ready.pop()
+            order.append(n)
+            try:
+                self._store(n, compile_expr(self.formulas[n])(self.env))
+            except Exception as e:
+                self.values.pop(n, None)
+                self.env.pop(n, None)
+                self.errors[n] = str(e) or type(e).__name__
+            for u in self.users.get(n, ()):
+                if u in waiting:
+                    waiting[u] -= 1
+                    if waiting[u] == 0:
+                        ready.append(u)
+        return order
+
+    def evaluate(self, text: str):
+        """"name = expr" تعریف می‌کند و مقدارش را برمی‌گرداند؛ بقیه فقط ارزیابی می‌شوند
+
+        نتیجه‌ی هر ارزیابی موفق در ans هم نوشته می‌شود.
+        """
+        name, expr = split_assignment(text)
+        if name is not None:
+            self.define(name, expr)
+            if name in self.errors:
+                raise ValueError(self.errors[name])
+            value = self.values[name]
+        else:
+            value = safe_eval(expr, self.values)
+        self.set_value("ans", value)
+        return value
+
+# ----------------------- ارزیابی افزایشی (ویرایش عبارت‌های بلند) -----------------------
+# متن در سطح جمع/تفریق و ضرب/تقسیمِ بیرونی (عمق پرانتز صفر) به تکه‌ها شکسته
+# می‌شود و مقدار هر تکه با کلید متنش کش می‌شود؛ پرانتزِ دربرگیرنده هم بازگشتی
+# شکسته می‌شود. با ویرایش یک رقم فقط تکه‌های مسیر آن رقم دوباره پارس و حساب
+# می‌شوند و بقیه از کش می‌آیند. ترتیب عملیات همان ترتیب پارسر است، پس نتیجه
+# دقیقاً برابر safe_eval است.
+_NAMES = re.compile(r"[A-Za-z]\w*")
+_ADD_SPLIT = re.compile(r"[()\[\]+\-]")
+_MUL_SPLIT = re.compile(r"\*\*|//|[()\[\]*/%]")
+
+def _is_binary(text: str, i: int) -> bool:
+    """آیا +/- در موقعیت i دوتایی است؟ (نه علامت یکانی و نه توان علمی مثل 1e-5)"""
+    j = i - 1
+    while j >= 0 and text[j].isspace():
+        j -= 1
+    if j < 0:
+        return False
+    c = text[j]
+    if c in "eE" and j == i - 1:
+        k = j - 1
+        while k >= 0 and (text[k].isdigit() or text[k] == "."):
+            k -= 1
+        if k < j - 1 and (k < 0 or not (text[k].isalnum() or text[k] == "_")):
+            return False                    # بخشی از یک عدد علمی
+    return c.isalnum() or c in ")._"
+
+def _split(text: str, pattern, binary):
+    """[(op, تکه), ...] در عمق صفر؛ اگر پرانتزها نامتوازن باشند None"""
+    parts, depth, start, op = [], 0, 0, None
+    for m in pattern.finditer(text):
+        ch = m.group()
+        if ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+            if depth < 0:
+                return None
+        elif depth == 0 and ch != "**" and binary(text, m.start()):
+            parts.append((op, text[start:m.start()]))
+            op, start = ch, m.end()
+    if depth:
+        return None
+    parts.append((op, text[start:]))
+    return parts
+
+class IncrementalEvaluator:
+    """ارزیابی پیاپی متن‌هایی که کمی با هم فرق دارند (مثل پیش‌نمایش هنگام تایپ)"""
+    CACHE_SIZE = 4096
+
+    def __init__(self, funcs=None):
+        self.funcs = ALLOWED_FUNCS if funcs is None else funcs
+        self._values = OrderedDict()        # متن تکه → مقدار (LRU)
+
+    def clear(self):
+        """بعد از تغییر متغیرهای funcs، مقدارهای کش‌شده دیگر معتبر نیستند"""
+        self._values.clear()
+
+    def evaluate(self, expr: str, mode: str = FLOAT, precision: int = DECIMAL_PREC):
+        expr = normalize((expr or "").strip())
+        if not expr:
+            return 0.0
+        if "__" in expr or not ALLOWED_PATTERN.match(expr):
+            raise ValueError("عبارت نامعتبر/غیرامن")
+        if mode != FLOAT:
+            # ترکیب تکه‌ها با عملگرهای float است؛ حالت‌های دیگر یک‌جا حساب می‌شوند
+            variables = {n: v for n, v in self.funcs.items() if ALLOWED_FUNCS.get(n, _UNSET) is not v}
+            return _run(compile_expr(expr, mode), variables, mode, precision)
+        if any((info := function_info(n)) is not None and not info.pure
+               for n in _NAMES.findall(expr)):
+            return compile_expr(expr)(self.funcs)   # مثل rand(): نتیجه کش‌شدنی نیست
+        return self._value(expr)
+
+    def _value(self, text: str):
+        v = self._values.get(text, _UNSET)
+        if v is not _UNSET:
+            self._values.move_to_end(text)
+            return v
+        v = self._compute(text)
+        self._values[text] = v
+        if len(self._values) > self.CACHE_SIZE:
+            self._values.popitem(last=False)
+        return v
+
+    def _combine(self, parts):
+        v = self._value(parts[0][1])
+        for op, piece in parts[1:]:
+            v = _BINOPS[op](v, self._value(piece))
+        return v
+
+    def _compute(self, text: str):
+        parts = _split(text, _ADD_SPLIT, _is_binary)
+        if parts and len(parts) > 1:
+            return self._combine(parts)
+        parts = _split(text, _MUL_SPLIT, lambda t, i: True)
+        if parts and len(parts) > 1:
+            return self._combine(parts)
+        s = text.strip()
+        if s[:1] == "(" and s[-1:] == ")":
+            inner = _split(s[1:-1], _MUL_SPLIT, lambda t, i: True)
+            if inner is not None:           # پرانتز اول واقعاً با آخری بسته می‌شود
+                return self._value(s[1:-1])
+        return compile_expr(text)(self.funcs)
+
+# ----------------------- قالب‌بندی -----------------------
+SUMMARY_THRESHOLD = 100    # آرایه‌ی بزرگ‌تر فقط با چند عنصر ابتدا/انتها و شکلش نمایش داده می‌شود
+
+MAX_EXACT_DIGITS = 1000   # عدد صحیح بزرگ‌تر به صورت علمی نمایش داده می‌شود
+_EXACT_BITS = int(MAX_EXACT_DIGITS / math.log10(2))
+
+def fmt(v) -> str:
+    """نمایش مناسب عدد (حذف اعشار اضافی)"""
+    t = type(v)
+    if t is float:
+        # فقط float‌هایی که عدد صحیح دقیق‌اند (تا 2^53) بدون اعشار؛ inf/nan هم امن
+        if abs(v) <= 9007199254740992.0 and abs(v - round(v)) < 1e-12:
+            return str(round(v))
+        return f"{v:.12g}"
+    if t is int:
+        return _fmt_int(v)
+    if isinstance(v, (int, float)):
+        return fmt(float(v) if isinstance(v, float) else int(v))     # bool و زیرکلاس‌ها
+    return _fmt_other(v)
+
+def num(v) -> str:
+    t = type(v)
+    if t is float:
+        return f"{v:.12g}"
+    if t is int:
+        return f"{v:.12g}" if v.bit_length() <= 1000 else _sci_int(v)
+    if isinstance(v, (int, float)):
+        return num(float(v) if isinstance(v, float) else int(v))
+    return _fmt_other(v)
+
+def _fmt_int(v: int) -> str:
+    """همه‌ی ارقام تا MAX_EXACT_DIGITS؛ بیشتر از آن علمی"""
+    return str(v) if v.bit_length() <= _EXACT_BITS else _sci_int(v)
+
+def _sci_int(v: int) -> str:
+    """نمایش علمی عدد صحیح بزرگ از روی ۶۴ بیت بالا – بدون تبدیل کامل به متن"""
+    shift = v.bit_length() - 64
+    lg = math.log10(abs(v) >> shift) + shift * math.log10(2)
+    exp = math.floor(lg)
+    return f"{'-' if v < 0 else ''}{10 ** (lg - exp):.10f}e+{exp}"
+
+def _fmt_other(v) -> str:
+    """آرایه → یک خط خلاصه؛ Fraction → p/q؛ Decimal با همه‌ی ارقامش؛
+    متن (مثلاً خلاصه‌ی ذخیره‌شده در تاریخچه) همان‌طور می‌ماند"""
+    if hasattr(v, "denominator"):                   # Fraction
+        if max(abs(v.numerator), v.denominator).bit_length() > _EXACT_BITS:
+            try:
+                return f"{float(v):.12g}"
+            except OverflowError:                   # بزرگ‌تر از بزرگ‌ترین float
+                return _sci_int(v.numerator // v.denominator)
+        return f"{v.numerator}/{v.denominator}"
+    if hasattr(v, "as_tuple"):                      # Decimal
+        if not v.is_finite():
+            return str(v).lower().replace("infinity", "inf")
+        if abs(v.adjusted()) >= MAX_EXACT_DIGITS:
+            return str(v)
+        text = format(v, "f")           # normalize با دقت context جاری گرد می‌کرد
+        return text.rstrip("0").rstrip(".") if "." in text else text
+    if not hasattr(v, "ndim"):
+        return str(v)
+    import numpy as np
+    text = np.array2string(v, separator=", ", threshold=SUMMARY_THRESHOLD, edgeitems=3,
+                           max_line_width=1 << 30, formatter={"float_kind": num})
+    text = text.replace("\n", "")
+    if v.size > SUMMARY_THRESHOLD:
+        text += f"  ({'×'.join(map(str, v.shape))})"
+    return text
+
+# ----------------------- مموری -----------------------
+class Memory:
+    def __init__(self):
+        self.value = 0.0
+
+    def clear(self):
+        self.value = 0.0
+
+    def add(self, v):
+        self.value += self._check(v)
+
+    def sub(self, v):
+        self.value -= self._check(v)
+
+    @staticmethod
+    def _check(v):
+        if not isinstance(v, (int, float)):
+            if hasattr(v, "denominator") or hasattr(v, "as_tuple"):
+                return float(v)         # Fraction / Decimal
+            raise TypeError("مموری فقط عدد نگه می‌دارد")
+        return v
+
+    def label(self) -> str:
+        """متن نشانگر مموری (اگر صفر باشد خالی)"""
+        return f"M: {num(self.value)}" if abs(self.value) > 1e-15 else ""
+
+# ----------------------- تاریخچه -----------------------
+# بدون ذخیره‌ی دیسکی، تاریخچه یک بافر حلقوی با ظرفیت ثابت است: نتیجه‌ها در
+# array('d') (بدون شیء float جدا برای هر مورد) و عبارت‌ها در یک جدول متن یکتا
+# با شمارش ارجاع، پس عبارت تکراری فقط یک بار در حافظه است. پس از پر شدن،
+# قدیمی‌ترین مورد حذف می‌شود و حافظه ثابت می‌ماند.
+HISTORY_CAP = 10_000
+
+_FLOAT, _INT, _OTHER = 0, 1, 2
+
+class _StringTable:
+    """متن → شماره‌ی یکتا؛ متنی که دیگر ارجاعی ندارد آزاد و شماره‌اش بازیافت می‌شود"""
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+        self.texts: list = []
+        self.refs = array("l")
+        self.free: list[int] = []
+
+    def add(self, text: str) -> int:
+        i = self.ids.get(text)
+        if i is None:
+            if self.free:
+                i = self.free.pop()
+                self.texts[i] = text
+                self.refs[i] = 0
+            else:
+                i = len(self.texts)
+                self.texts.append(text)
+                self.refs.append(0)
+            self.ids[text] = i
+        self.refs[i] += 1
+        return i
+
+    def release(self, i: int):
+        self.refs[i] -= 1
+        if not self.refs[i]:
+            del self.ids[self.texts[i]]
+            self.texts[i] = None
+            self.free.append(i)
+
+    def __len__(self):
+        return len(self.ids)
+
+class CompactLog:
+    """بافر حلقوی (expr, result) با ظرفیت cap؛ 0 = قدیمی‌ترینِ موجود"""
+    def __init__(self, cap: int = HISTORY_CAP):
+        if cap < 1:
+            raise ValueError("ظرفیت تاریخچه باید مثبت باشد")
+        self.cap = cap
+        self.strings = _StringTable()
+        self._exprs = array("l")            # شماره‌ی متن در strings
+        self._vals = array("d")
+        self._kinds = bytearray()           # float / int دقیق / بقیه در _extra
+        self._extra: dict[int, object] = {} # خانه → عدد صحیح بزرگ، خلاصه‌ی آرایه و …
+        self._start = 0
+
+    def append(self, expr: str, result) -> bool:
+        """True اگر قدیمی‌ترین مورد برای جا باز کردن حذف شد"""
+        sid = self.strings.add(expr)
+        t = type(result)
+        if t is float:
+            kind, v = _FLOAT, result
+        elif t is int and -(1 << 53) <= result <= 1 << 53:
+            kind, v = _INT, float(result)
+        else:
+            kind, v = _OTHER, 0.0
+        if len(self._vals) < self.cap:
+            slot = len(self._vals)
+            self._exprs.append(sid)
+            self._vals.append(v)
+            self._kinds.append(kind)
+            evicted = False
+        else:
+            slot = self._start
+            self.strings.release(self._exprs[slot])
+            self._extra.pop(slot, None)
+            self._exprs[slot], self._vals[slot], self._kinds[slot] = sid, v, kind
+            self._start = (slot + 1) % self.cap
+            evicted = True
+        if kind == _OTHER:
+            self._extra[slot] = result
+        return evicted
+
+    def __len__(self):
+        return len(self._vals)
+
+    def __getitem__(self, i: int):
+        n = len(self._vals)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("history index out of range")
+        slot = (self._start + i) % n
+        kind = self._kinds[slot]
+        if kind == _FLOAT:
+            res = self._vals[slot]
+        elif kind == _INT:
+            res = int(self._vals[slot])
+        else:
+            res = self._extra[slot]
+        return self.strings.texts[self._exprs[slot]], res
+
+def open_store():
+    """تاریخچه‌ی دائمی روی دیسک؛ اگر ممکن نبود None (فقط حافظه)"""
+    from history_store import HistoryStore
+    try:
+        return HistoryStore()
+    except OSError:
+        return None     # مثلاً پوشه‌ی خانه فقط‌خواندنی است
+
+class History:
+    """تاریخچه‌ی ارزیابی‌ها (0 = قدیمی‌ترین)؛ با store روی دیسک، وگرنه CompactLog در حافظه"""
+    def __init__(self, store=None, cap: int = HISTORY_CAP):
+        self.store = store
+        self.log = CompactLog(cap) if store is None else None   # دیسک خودش منبع است
+
+    def push(self, expr: str, result) -> bool:
+        """True اگر قدیمی‌ترین مورد حذف شد (شماره‌ها یکی جابه‌جا شده‌اند)"""
+        if not isinstance(result, (int, float)) and hasattr(result, "ndim"):
+            result = fmt(result)        # آرایه‌ها فقط به صورت خلاصه نگه داشته می‌شوند
+        if self.store is not None:
+            self.store.append(expr, result)
+            return False
+        return self.log.append(expr, result)
+
+    def _source(self):
+        return self.store if self.store is not None else self.log
+
+    def __len__(self):
+        src = self._source()
+        return len(src) if src is not None else 0
+
+    def __getitem__(self, i):
+        src = self._source()
+        if src is None:
+            raise IndexError("history is closed")
+        return src[i]
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+# ----------------------- ارزیابی برداری (NumPy) -----------------------
+@lru_cache(maxsize=None)
+def vector_funcs() -> dict:
+    """معادل ufunc توابع مجاز – numpy فقط در اولین استفاده import می‌شود"""
+    import numpy as np
+
+    def ln(x, base=None):
+        return np.log(x) if base is None else np.log(x) / np.log(base)
+
+    return {
+        "sqrt": np.sqrt, "sin": np.sin, "cos": np.cos, "tan": np.tan,
+        "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan,
+        "log": np.log10, "ln": ln, "abs": np.abs, "round": np.round,
+        "floor": np.floor, "ceil": np.ceil,
+        "pi": math.pi, "e": math.e, "inf": math.inf,
+        "__vector__": True,         # نشانه‌ی env برداری برای _load
+        "__registry__": True,
+    }
+
+def batch_eval(expr: str, **variables):
+    """یک عبارت با متغیرهای آزاد (مثل x و y) روی کل آرایه‌ها در یک اجرا
+
+    هر مقدار می‌تواند آرایه‌ی NumPy، لیست یا هر buffer عددی باشد.
+    خروجی آرایه‌ی float64 با شکل broadcast‌شده‌ی ورودی‌هاست؛
+    دامنه‌ی نامعتبر (مثل sqrt منفی) به جای خطا nan می‌دهد.
+    """
+    import numpy as np
+
+    funcs = vector_funcs()
+    env = dict(funcs)
+    for name, value in variables.items():
+        if name in funcs or is_function(name):
+            raise ValueError(f"نام متغیر با تابع/ثابت تداخل دارد: {name}")
+        env[name] = np.asarray(value, dtype=np.float64)
+    shape = np.broadcast_shapes(*(env[n].shape for n in variables))
+
+    expr = normalize((expr or "").strip())
+    if not expr:
+        return np.zeros(shape)
+    f = compile_expr(expr)
+    try:
+        with np.errstate(all="ignore"):
+            out = np.asarray(f(env), dtype=np.float64)
+    except ArithmeticError:
+        # بخش ثابت (مثل 1/0) با عملگرهای پایتون خطا داد، نه NumPy؛ خطای شکل بالا می‌رود
+        return np.full(shape, np.nan)
+    if out.shape != shape:
+        out = np.broadcast_to(out, shape).copy()
+    return out
+
+# ----------------------- حل معادله f(x) = 0 -----------------------
+SOLVE_SAMPLES = 20_000      # تعداد بازه‌های پیمایش برداری
+SOLVE_XTOL = 1e-14
+SOLVE_FTOL = 1e-3           # |f(ریشه)| باید این قدر کوچک‌تر از |f| سر بازه باشد
+SOLVE_PROBE = 1e-3          # فاصله‌ی نقطه‌های آزمون دو طرف ریشه (نسبت به طول بازه)
+
+def _brent(f, a, b, fa, fb, maxiter=100):
+    """روش Brent (ترکیب وتری/درون‌یابی معکوس با دوبخشی) روی بازه‌ی تغییر علامت"""
+    c, fc = b, fb
+    d = e = b - a
+    for _ in range(maxiter):
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2 * 2.2e-16 * abs(b) + 0.5 * SOLVE_XTOL
+        xm = 0.5 * (c - b)
+        if abs(xm) <= tol or fb == 0:
+            return b
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                p, q = 2 * xm * s, 1 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2 * xm * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * xm * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = xm
+        else:
+            d = e = xm
+        a, fa = b, fb
+        b += d if abs(d) > tol else math.copysign(tol, xm)
+        fb = f(b)
+    return b
+
+def solve(expr: str, var: str = "x", lo: float = -10.0, hi: float = 10.0,
+          samples: int = SOLVE_SAMPLES, variables=None) -> list[float]:
+    """همه‌ی ریشه‌های f(var) = 0 در [lo, hi] که علامت f در آن‌ها عوض می‌شود
+
+    یک پیمایش برداری (batch_eval) همه‌ی بازه‌های تغییر علامت را پیدا می‌کند و
+    هر کدام با Brent روی همان عبارت کامپایل‌شده‌ی کش‌شده پالایش می‌شود.
+    پرش‌های ناپیوسته (مثل مجانب tan یا floor) چون |f| آن‌جا کوچک نمی‌شود کنار گذاشته می‌شوند.
+    ریشه‌ی مضاعف بدون تغییر علامت (مثل x^2) فقط اگر روی نقطه‌ی شبکه بیفتد پیدا می‌شود.
+    variables: متغیرهای عددی دیگر (مثل a در a*x - 1)
+    """
+    import numpy as np
+
+    lo, hi = float(lo), float(hi)
+    if not lo < hi:
+        raise ValueError("بازه‌ی نامعتبر: باید lo < hi باشد")
+    xs = np.linspace(lo, hi, samples + 1)
+    variables = {k: v for k, v in (variables or {}).items() if k != var}
+    ys = batch_eval(expr, **variables, **{var: xs})
+
+    f0 = compile_expr(normalize(expr.strip()))
+    env = {**ALLOWED_FUNCS, **variables}
+
+    def f(v):
+        env[var] = v
+        return f0(env)
+
+    roots = [float(v) for v in xs[ys == 0]]
+    sa, sb = np.sign(ys[:-1]), np.sign(ys[1:])
+    finite = np.isfinite(ys)
+    # nan در ضرب نتیجه‌ی < 0 نمی‌دهد؛ سری که روی قطب افتاده (inf) ریشه نمی‌سازد
+    for i in np.flatnonzero((sa * sb < 0) & finite[:-1] & finite[1:]):
+        a, b, fa, fb = float(xs[i]), float(xs[i + 1]), float(ys[i]), float(ys[i + 1])
+        d = SOLVE_PROBE * (b - a)
+        try:
+            r = _brent(f, a, b, fa, fb)
+            fr = f(r)
+            near = max(abs(f(r - d)), abs(f(r + d)))
+        except (ArithmeticError, ValueError):
+            continue
+        bound = max(abs(fa), abs(fb))
+        # ریشه، نه قطب یا پرش: |f| در r خیلی کوچک است و کنارش هم کوچک می‌ماند
+        if abs(fr) < SOLVE_FTOL * bound and near <= bound:
+            roots.append(r)
+    roots.sort()
+    return roots
+
+# ----------------------- انتگرال و مشتق عددی -----------------------
+# integrate(f, x, a, b) و diff(f, x, at) فرم‌های ویژه‌ی کامپایلرند: آرگومان اول
+# ارزیابی نمی‌شود، بلکه یک بار به تابع برداری x → f(x) کامپایل می‌شود و همه‌ی
+# نقاط هر مرحله (گره‌های Gauss–Kronrod یا گام‌های Richardson) با یک فراخوانی
+# روی آرایه حساب می‌شوند. کران‌ها و نقطه‌ی مشتق عبارت‌های معمولی‌اند.
+CALCULUS_FORMS = {"integrate": 4, "diff": 3}
+QUAD_RTOL, QUAD_ATOL = 1e-10, 1e-12
+QUAD_MAX_INTERVALS = 20_000
+DIFF_H0 = 0.01             # گام آغازین نسبت به max(|x|, 1)
+DIFF_HMIN = 2.2e-16 ** (1 / 3)   # کوچک‌ترین گام نسبی؛ کوچک‌تر فقط نویز گرد کردن است
+DIFF_CON = 1.4              # نسبت گام‌های پیاپی (Ridders)
+DIFF_SAFE = 2.0             # رشد خطا به این نسبت → نویز شروع شده، توقف
+DIFF_RTOL = 1e-8
+
+# Kronrod-15 (گره‌های نامنفی، آخری صفر) و Gauss-7 روی گره‌های فرد همان‌ها
+_GK_X = (0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+         0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+         0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+         0.207784955007898467600689403773245, 0.0)
+_GK_WK = (0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+          0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+          0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+          0.204432940075298892414161999234649, 0.209482141084727828012999174891714)
+_GK_WG = (0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+          0.381830050505118944950369775488975, 0.417959183673469387755102040816327)
+
+@lru_cache(maxsize=None)
+def _gk15():
+    """(گره‌ها، وزن‌های Kronrod، وزن‌های Gauss) روی [-1, 1]"""
+    import numpy as np
+    x, wk = np.array(_GK_X), np.array(_GK_WK)
+    wg = np.zeros(8)
+    wg[1::2] = _GK_WG
+    sym = lambda v, sign=1: np.concatenate([sign * v[:-1], v[::-1]])
+    return sym(x, -1), sym(wk), sym(wg)
+
+def _finite(f, a, b):
+    """کران بی‌نهایت → تغییر متغیر به بازه‌ی متناهی: (g, lo, hi)"""
+    inf_a, inf_b = math.isinf(a), math.isinf(b)
+    if inf_a and inf_b:                             # x = t / (1 - t²)
+        return (lambda t: f(t / (1 - t * t)) * (1 + t * t) / (1 - t * t) ** 2), -1.0, 1.0
+    if inf_b:                                       # x = a + t / (1 - t)
+        return (lambda t: f(a + t / (1 - t)) / (1 - t) ** 2), 0.0, 1.0
+    if inf_a:                                       # x = b - t / (1 - t)
+        return (lambda t: f(b - t / (1 - t)) / (1 - t) ** 2), 0.0, 1.0
+    return f, a, b
+
+def gauss_kronrod(f, a: float, b: float, rtol: float = QUAD_RTOL, atol: float = QUAD_ATOL,
+                  max_intervals: int = QUAD_MAX_INTERVALS) -> float:
+    """∫ f از a تا b با Gauss–Kronrod (7, 15) تطبیقی؛ f آرایه‌ی x می‌گیرد و آرایه‌ی y می‌دهد
+
+    در هر دور همه‌ی بازه‌هایی که خطایشان (|K15 − G7|) از سهمشان به نسبت طول بیشتر
+    است نصف می‌شوند و گره‌های همه‌ی نیمه‌ها با یک فراخوانی f حساب می‌شوند؛ بقیه
+    کنار گذاشته و فقط جمعشان نگه داشته می‌شود.
+    """
+    import numpy as np
+
+    if math.isnan(a) or math.isnan(b):
+        raise ValueError("کران انتگرال nan است")
+    if a == b:
+        return 0.0
+    if a > b:
+        return -gauss_kronrod(f, b, a, rtol, atol, max_intervals)
+    g, lo, hi = _finite(f, a, b)
+    nodes, wk, wg = _gk15()
+    edges = np.linspace(lo, hi, 5)
+    left, right = edges[:-1], edges[1:]
+    done_val = done_err = 0.0
+    count = len(left)
+    while True:
+        c, h = (left + right) / 2, (right - left) / 2
+        xs = c[:, None] + h[:, None] * nodes
+        with np.errstate(all="ignore"):
+            ys = np.broadcast_to(np.asarray(g(xs), dtype=np.float64), xs.shape)
+        k = h * (ys @ wk)
+        err = np.abs(k - h * (ys @ wg))
+        val, total_err = done_val + k.sum(), done_err + err.sum()
+        if not math.isfinite(val):
+            raise ValueError("انتگرال واگراست یا تابع در بازه تعریف نشده است")
+        tol = max(atol, rtol * abs(val))
+        if total_err <= tol:
+            return float(val)
+        split = (err > tol * (right - left) / (hi - lo)) & (h > 4e-16 * np.maximum(np.abs(c), 1e-300))
+        n = int(split.sum())
+        if not n or count + n > max_intervals:
+            if total_err <= max(atol, 1e-6 * abs(val)):
+                return float(val)           # دقت کمتر از rtol، ولی هنوز قابل اعتماد
+            raise ValueError(f"انتگرال همگرا نشد (تخمین خطا {total_err:.3g})")
+        done_val += k[~split].sum()
+        done_err += err[~split].sum()
+        ls, rs = left[split], right[split]
+        mid = (ls + rs) / 2
+        left, right = np.concatenate([ls, mid]), np.concatenate([mid, rs])
+        count += n
+
+def richardson_diff(f, x: float) -> float:
+    """f'(x) با تفاضل مرکزی و برون‌یابی Richardson (جدول Neville، روش Ridders)
+
+    گام‌ها از h0 = DIFF_H0·max(|x|, 1) هر بار DIFF_CON برابر کوچک می‌شوند، نه کمتر
+    از DIFF_HMIN·max(|x|, 1)، و همه‌ی نقطه‌ها با یک فراخوانی f حساب می‌شوند. سطرهای
+    نامتناهی (از دامنه یا قطب رد شده) کنار می‌روند؛ جدول وقتی خطا DIFF_SAFE برابر
+    بهترین خطایش شود متوقف می‌شود و فقط اگر هنوز به DIFF_RTOL نرسیده جدول تازه‌ای
+    از همان سطر شروع می‌شود. اگر هیچ‌کدام نرسد خطا می‌دهد.
+    """
+    import numpy as np
+
+    scale = max(abs(x), 1.0)
+    steps = int(math.log(DIFF_H0 / DIFF_HMIN) / math.log(DIFF_CON)) + 1
+    h = DIFF_H0 * scale / DIFF_CON ** np.arange(steps)
+    with np.errstate(all="ignore"):
+        ys = np.broadcast_to(np.asarray(f(np.concatenate([x + h, x - h, [x]])), dtype=np.float64),
+                             (2 * steps + 1,))
+        d = (ys[:steps] - ys[steps:-1]) / (2 * h)
+    fx = float(ys[-1])
+    if not math.isfinite(fx):                   # خود f(x) هم باید تعریف شده باشد
+        raise ValueError("مشتق در این نقطه قابل محاسبه نیست")
+    finite = np.isfinite(d)
+    best, best_err = math.nan, math.inf
+    converged = lambda: best_err <= DIFF_RTOL * max(abs(best), abs(fx) / scale, 1e-12)
+    start = 0
+    while start < steps and not converged():
+        # یک جدول از start؛ اگر به دقت نرسید (سطرهای اول از قطب گذشته بودند)
+        # جدول تازه از همان سطری که متوقفش کرد
+        prev, err, i = None, math.inf, start
+        while i < steps and finite[i]:
+            row = [float(d[i])]
+            if prev is not None:
+                fac = 1.0
+                for j in range(1, len(prev) + 1):
+                    fac *= DIFF_CON * DIFF_CON
+                    row.append((row[j - 1] * fac - prev[j - 1]) / (fac - 1))
+                    e = max(abs(row[j] - row[j - 1]), abs(row[j] - prev[j - 1]))
+                    if e <= err:
+                        err = e
+                        if e <= best_err:
+                            best, best_err = row[j], e
+                if abs(row[-1] - prev[-1]) >= DIFF_SAFE * err:
+                    break
+            prev = row
+            i += 1
+        start = i if i > start + 1 else start + 1
+    if not converged():
+        raise ValueError("مشتق همگرا نشد (تابع در این نقطه هموار نیست؟)")
+    return best
@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+
+# خانواده‌های توابع افزونه‌ی موتور ماشین‌حساب
+# هر ماژول FUNCS = {نام: FuncInfo} دارد و فقط وقتی calc_engine یکی از
+# نام‌هایش را در عبارتی ببیند import می‌شود (FAMILIES در calc_engine).
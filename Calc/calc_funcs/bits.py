@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+# عملیات بیتی روی اعداد صحیح؛ روی آرایه‌ها هم مستقیم کار می‌کنند (int64)
+
+from calc_engine import FuncInfo, COST_CHEAP, MAX_POW_BITS
+
+def _int(a):
+    if hasattr(a, "astype"):
+        return a.astype("int64")
+    if a != int(a):
+        raise ValueError("عملیات بیتی فقط روی عدد صحیح تعریف شده است")
+    return int(a)
+
+def band(a, b):
+    return _int(a) & _int(b)
+
+def bor(a, b):
+    return _int(a) | _int(b)
+
+def bxor(a, b):
+    return _int(a) ^ _int(b)
+
+def bnot(a):
+    return ~_int(a)
+
+def shl(a, n):
+    n = _int(n)
+    if not hasattr(n, "astype") and n > MAX_POW_BITS:
+        raise OverflowError("نتیجه‌ی شیفت بیش از حد بزرگ است")
+    return _int(a) << n
+
+def shr(a, n):
+    return _int(a) >> _int(n)
+
+def popcount(a):
+    return bin(_int(a)).count("1")
+
+FUNCS = {f.__name__: FuncInfo(f, vector=True, cost=COST_CHEAP)
+         for f in (band, bor, bxor, bnot, shl, shr)}
+FUNCS["popcount"] = FuncInfo(popcount, cost=COST_CHEAP)
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+# توابع مالی با قرارداد علامت صفحه‌گسترده‌ها (پرداخت منفی، دریافت مثبت)
+#   fv(rate, nper, pmt, pv=0) • pv(rate, nper, pmt, fv=0) • pmt(rate, nper, pv, fv=0)
+#   nper(rate, pmt, pv, fv=0) • npv(rate, cf1, cf2, ...) • irr(cf0, cf1, ...)
+
+import math
+
+from calc_engine import FuncInfo, COST_HEAVY
+
+def fv(rate, nper, pmt, pv=0):
+    if rate == 0:
+        return -(pv + pmt * nper)
+    g = (1 + rate) ** nper
+    return -(pv * g + pmt * (g - 1) / rate)
+
+def pv(rate, nper, pmt, fv=0):
+    if rate == 0:
+        return -(fv + pmt * nper)
+    g = (1 + rate) ** nper
+    return -(fv + pmt * (g - 1) / rate) / g
+
+def pmt(rate, nper, pv, fv=0):
+    if rate == 0:
+        return -(pv + fv) / nper
+    g = (1 + rate) ** nper
+    return -(pv * g + fv) * rate / (g - 1)
+
+def nper(rate, pmt, pv, fv=0):
+    if rate == 0:
+        return -(pv + fv) / pmt
+    return math.log((pmt - fv * rate) / (pmt + pv * rate)) / math.log(1 + rate)
+
+def _flows(args):
+    if len(args) == 1 and hasattr(args[0], "ravel"):
+        return args[0].ravel().tolist()
+    return list(args)
+
+def npv(rate, *flows):
+    """ارزش فعلی جریان‌ها در پایان دوره‌های 1، 2، …"""
+    return sum(c / (1 + rate) ** (i + 1) for i, c in enumerate(_flows(flows)))
+
+def irr(*flows):
+    """نرخی که npv جریان‌ها (از دوره‌ی 0) را صفر می‌کند؛ دوبخشی روی اولین تغییر علامت"""
+    flows = _flows(flows)
+    f = lambda r: sum(c / (1 + r) ** i for i, c in enumerate(flows))
+    grid = [-0.99 + 0.01 * k for k in range(100)] + [0.01 * 1.1 ** k for k in range(80)]
+    grid.sort()
+    prev_r, prev_v = grid[0], f(grid[0])
+    for r in grid[1:]:
+        v = f(r)
+        if (v > 0) != (prev_v > 0):
+            lo, hi, flo = prev_r, r, prev_v
+            for _ in range(200):
+                mid = (lo + hi) / 2
+                fm = f(mid)
+                if (fm > 0) == (flo > 0):
+                    lo, flo = mid, fm
+                else:
+                    hi = mid
+                if hi - lo < 1e-15:
+                    break
+            return (lo + hi) / 2
+        prev_r, prev_v = r, v
+    raise ValueError("irr: نرخی با npv صفر پیدا نشد")
+
+FUNCS = {
+    "fv": FuncInfo(fv),
+    "pv": FuncInfo(pv),
+    "pmt": FuncInfo(pmt),
+    "nper": FuncInfo(nper),
+    "npv": FuncInfo(npv, cost=50),
+    "irr": FuncInfo(irr, cost=COST_HEAVY),
+}
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+
+# اعداد تصادفی – تنها خانواده‌ی غیرخالص: تا نمی‌شوند و هر فراخوانی جداست
+
+import random
+
+from calc_engine import FuncInfo, COST_CHEAP
+
+def rand():
+    return random.random()
+
+def randint(a, b):
+    return random.randint(int(a), int(b))
+
+FUNCS = {
+    "rand": FuncInfo(rand, pure=False, cost=COST_CHEAP),
+    "randint": FuncInfo(randint, pure=False, cost=COST_CHEAP),
+}
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+# توابع خاص: گاما، تابع خطا، بتا و ترکیبیات
+
+import math
+
+from calc_engine import FuncInfo, COST_HEAVY
+
+MAX_FACT = 20_000       # factorial بزرگ‌تر هم کند است و هم نمایش‌ناپذیر
+MAX_BITS = int(math.lgamma(MAX_FACT + 1) / math.log(2)) + 1    # همان سقف برای comb/perm
+
+def _int(n, what):
+    if n != int(n) or n < 0:
+        raise ValueError(f"{what} فقط برای عدد صحیح نامنفی تعریف شده است")
+    return int(n)
+
+def beta(a, b):
+    return math.exp(math.lgamma(a) + math.lgamma(b) - math.lgamma(a + b))
+
+def fact(n):
+    n = _int(n, "fact")
+    if n > MAX_FACT:
+        raise OverflowError("نتیجه‌ی fact بیش از حد بزرگ است")
+    return math.factorial(n)
+
+def _check_bits(lg, what):
+    # اندازه‌ی نتیجه از روی lgamma، پیش از محاسبه‌ی خود عدد
+    if lg / math.log(2) > MAX_BITS:
+        raise OverflowError(f"نتیجه‌ی {what} بیش از حد بزرگ است")
+
+def comb(n, k):
+    n, k = _int(n, "comb"), _int(k, "comb")
+    if k <= n:
+        _check_bits(math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1), "comb")
+    return math.comb(n, k)
+
+def perm(n, k):
+    n, k = _int(n, "perm"), _int(k, "perm")
+    if k <= n:
+        _check_bits(math.lgamma(n + 1) - math.lgamma(n - k + 1), "perm")
+    return math.perm(n, k)
+
+FUNCS = {
+    "gamma": FuncInfo(math.gamma),
+    "lgamma": FuncInfo(math.lgamma),
+    "erf": FuncInfo(math.erf),
+    "erfc": FuncInfo(math.erfc),
+    "beta": FuncInfo(beta),
+    "fact": FuncInfo(fact, cost=COST_HEAVY),
+    "comb": FuncInfo(comb, cost=COST_HEAVY),
+    "perm": FuncInfo(perm, cost=COST_HEAVY),
+}
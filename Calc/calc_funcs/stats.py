@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+# آمار توصیفی: median(1,2,3) یا median([1,2,3])
+
+import statistics
+
+from calc_engine import FuncInfo
+
+def _values(args):
+    if len(args) == 1 and hasattr(args[0], "ravel"):
+        return args[0].ravel().tolist()
+    if not args:
+        raise ValueError("حداقل یک مقدار لازم است")
+    return list(args)
+
+def median(*a):
+    return statistics.median(_values(a))
+
+def mode(*a):
+    return statistics.mode(_values(a))
+
+def stdev(*a):
+    return statistics.stdev(_values(a))
+
+def pstdev(*a):
+    return statistics.pstdev(_values(a))
+
+def variance(*a):
+    return statistics.variance(_values(a))
+
+def pvariance(*a):
+    return statistics.pvariance(_values(a))
+
+def gmean(*a):
+    return statistics.geometric_mean(_values(a))
+
+def hmean(*a):
+    return statistics.harmonic_mean(_values(a))
+
+FUNCS = {f.__name__: FuncInfo(f, cost=50)
+         for f in (median, mode, stdev, pstdev, variance, pvariance, gmean, hmean)}
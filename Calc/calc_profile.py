@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# زمان‌سنجی مراحل هر ارزیابی (بدون Qt)
+# برای هر مرحله یک هیستوگرام با اندازه‌ی ثابت نگه داشته می‌شود (سطل‌های توان ۲
+# بر حسب میکروثانیه)، پس حافظه با تعداد ارزیابی‌ها بزرگ نمی‌شود.
+# وقتی enabled خاموش است فراخواننده‌ها فقط همین یک پرچم را چک می‌کنند.
+
+import json, time
+
+STAGES = ("normalize", "validate", "compile", "eval", "format", "history", "total")
+BUCKETS = 24        # سطل k: [2^(k-1), 2^k) میکروثانیه؛ سطل آخر بی‌انتهاست
+
+clock = time.perf_counter_ns
+
+class Histogram:
+    __slots__ = ("counts", "n", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.n = self.total_ns = self.max_ns = 0
+
+    def add(self, ns: int):
+        k = (ns // 1000).bit_length()
+        self.counts[k if k < BUCKETS else BUCKETS - 1] += 1
+        self.n += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile(self, q: float) -> float:
+        """حد بالای سطلی که صدک q در آن است (میکروثانیه، حداکثر برابر max)"""
+        top = self.max_ns / 1000
+        target, seen = q * self.n, 0
+        for k, c in enumerate(self.counts[:-1]):
+            seen += c
+            if seen >= target:
+                return min(float(1 << k), top)
+        return top
+
+    def as_dict(self) -> dict:
+        return {
+            "n": self.n,
+            "mean_us": round(self.total_ns / self.n / 1000, 3) if self.n else 0.0,
+            "p50_us": self.percentile(0.50),
+            "p99_us": self.percentile(0.99),
+            "max_us": round(self.max_ns / 1000, 3),
+            "buckets_us": {f"<{1 << k}": c for k, c in enumerate(self.counts) if c},
+        }
+
+class Profiler:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.hists = {s: Histogram() for s in STAGES}
+
+    def record(self, stage: str, ns: int):
+        self.hists[stage].add(ns)
+
+    def record_all(self, timings: dict):
+        for stage, ns in timings.items():
+            self.hists[stage].add(ns)
+
+    def reset(self):
+        for h in self.hists.values():
+            h.__init__()
+
+    def snapshot(self) -> dict:
+        return {s: h.as_dict() for s, h in self.hists.items()}
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       "stages": self.snapshot()}, f, indent=2)
+
+    def report(self) -> str:
+        lines = [f"{'stage':<10} {'n':>7} {'mean µs':>9} {'p50 µs':>8} {'p99 µs':>8} {'max µs':>9}"]
+        for s, h in self.hists.items():
+            d = h.as_dict()
+            lines.append(f"{s:<10} {d['n']:>7} {d['mean_us']:>9.1f} {d['p50_us']:>8.0f} "
+                         f"{d['p99_us']:>8.0f} {d['max_us']:>9.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# سرور محلی JSON-RPC 2.0 برای ارزیابی با همان safe_eval (بدون Qt)
+# هر پیام یک خط JSON است و اتصال‌ها پایدارند. درخواست‌های هم‌زمانِ همه‌ی
+# اتصال‌ها در یک صف جمع و به صورت دسته‌ای به استخر پروسه‌ها فرستاده می‌شوند.
+#
+#   cd Calc
+#   python -m calc_server --port 8765            (یا --unix /tmp/calc.sock)
+#
+# متدها:
+#   eval       {"expr": "2^10"}            → 1024
+#   eval_many  {"exprs": ["1+1", "1/0"]}   → [{"result": 2}, {"error": "..."}]
+#   stats      {}                          → شمارنده‌های توان عملیاتی و تأخیر
+
+import os, json, math, time, socket, asyncio, argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from calc_engine import safe_eval, fmt
+
+HOST, PORT = "127.0.0.1", 8765
+LINE_LIMIT = 64 * 1024 * 1024        # بیشینه‌ی طول یک پیام (بایت)؛ پیش‌فرض asyncio فقط 64 KiB است
+
+# ----------------------- کار در پروسه‌ی کارگر -----------------------
+def eval_batch(exprs: list[str]) -> list[tuple[bool, object]]:
+    out = []
+    for e in exprs:
+        try:
+            out.append((True, safe_eval(e)))
+        except Exception as ex:
+            out.append((False, str(ex) or type(ex).__name__))
+    return out
+
+def _json_value(v):
+    """inf/nan در JSON استاندارد نیستند؛ به صورت متن فرستاده می‌شوند
+    (در آرایه‌ها هم). عدد صحیح خیلی بزرگ و کسر/Decimal به صورت متن fmt می‌روند."""
+    if isinstance(v, float):
+        return v if math.isfinite(v) else str(v)
+    if isinstance(v, int):
+        return v if v.bit_length() <= 10_000 else fmt(v)    # json.dumps سقف ۴۳۰۰ رقم دارد
+    if hasattr(v, "tolist"):                       # آرایه‌ی NumPy
+        return _json_value(v.tolist())
+    if isinstance(v, list):
+        return [_json_value(x) for x in v]
+    return fmt(v)
+
+def _dumps(resp) -> bytes:
+    """پاسخ → یک خط JSON؛ اگر مقداری قابل تبدیل نبود به جای آن خطای JSON-RPC می‌رود"""
+    try:
+        return json.dumps(resp).encode() + b"\n"
+    except (TypeError, ValueError) as e:
+        if isinstance(resp, list):                 # batch: فقط همان پاسخ خراب
+            return b"[" + b",".join(_dumps(r)[:-1] for r in resp) + b"]\n"
+        return json.dumps(_error(resp.get("id"), -32603, f"Internal error: {e}")).encode() + b"\n"
+
+async def _read_line(reader):
+    """(خط، بیش از حد بلند بود؟)؛ خط بلندتر از LINE_LIMIT تا انتهایش دور ریخته می‌شود"""
+    too_long = False
+    while True:
+        try:
+            line = await reader.readuntil(b"\n")
+        except asyncio.LimitOverrunError as e:
+            too_long = True
+            await reader.readexactly(e.consumed)
+            continue
+        except asyncio.IncompleteReadError as e:       # پایان اتصال
+            line = e.partial
+        return (b"" if too_long else line), too_long
+
+# ----------------------- شمارنده‌ها -----------------------
+class Stats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = self.exprs = self.errors = 0
+        self.batches = self.batch_items = 0
+        self.latencies = deque(maxlen=10_000)     # ثانیه، برای هر عبارت
+
+    def snapshot(self) -> dict:
+        up = time.monotonic() - self.started
+        lat = sorted(self.latencies)
+        pct = lambda q: round(1000 * lat[min(len(lat) - 1, int(q * len(lat)))], 3) if lat else None
+        return {
+            "uptime_s": round(up, 3),
+            "requests": self.requests,
+            "exprs": self.exprs,
+            "errors": self.errors,
+            "exprs_per_sec": round(self.exprs / up, 1) if up else 0.0,
+            "batches": self.batches,
+            "avg_batch": round(self.batch_items / self.batches, 2) if self.batches else 0.0,
+            "p50_ms": pct(0.50),
+            "p99_ms": pct(0.99),
+        }
+
+# ----------------------- دسته‌بندی درخواست‌ها -----------------------
+class Batcher:
+    """عبارت‌های هم‌زمان را جمع می‌کند و هر دسته را یک‌جا به استخر می‌دهد"""
+    def __init__(self, pool, workers: int, stats: Stats, max_batch=256, max_delay=0.001,
+                 renew=None):
+        self.pool, self.stats = pool, stats
+        self.renew = renew                        # استخر خراب → استخر تازه (مثل کارگر calc_worker)
+        self.max_batch, self.max_delay = max_batch, max_delay
+        self.queue = asyncio.Queue()
+        self.slots = asyncio.Semaphore(workers)   # هر کارگر حداکثر یک دسته در جریان
+
+    async def submit(self, expr: str):
+        fut = asyncio.get_running_loop().create_future()
+        await self.queue.put((expr, fut, time.monotonic()))
+        return await fut
+
+    async def run(self):
+        while True:
+            items = [await self.queue.get()]
+            await self.slots.acquire()
+            if self.queue.empty():
+                await asyncio.sleep(self.max_delay)     # فرصت کوتاه برای رسیدن بقیه
+            while len(items) < self.max_batch and not self.queue.empty():
+                items.append(self.queue.get_nowait())
+            asyncio.get_running_loop().create_task(self._dispatch(items))
+
+    async def _dispatch(self, items):
+        loop = asyncio.get_running_loop()
+        exprs = [e for e, _, _ in items]
+        try:
+            pool = self.pool
+            try:
+                results = await loop.run_in_executor(pool, eval_batch, exprs)
+            except BrokenProcessPool:
+                # پروسه‌ی کارگری از بین رفت و استخر دیگر کار نمی‌کند: استخر تازه و یک تلاش دیگر
+                if self.renew is None:
+                    raise
+                if self.pool is pool:                    # دسته‌های هم‌زمان فقط یک بار می‌سازند
+                    self.pool = self.renew()
+                results = await loop.run_in_executor(self.pool, eval_batch, exprs)
+        except Exception as ex:                          # مثلاً همین دسته کارگر را از بین برد
+            results = [(False, str(ex) or type(ex).__name__)] * len(items)
+        finally:
+            self.slots.release()
+        now = time.monotonic()
+        self.stats.batches += 1
+        self.stats.batch_items += len(items)
+        for (_, fut, t0), res in zip(items, results):
+            self.stats.latencies.append(now - t0)
+            if not fut.done():
+                fut.set_result(res)
+
+# ----------------------- JSON-RPC -----------------------
+def _error(id_, code, message):
+    return {"jsonrpc": "2.0", "id": id_, "error": {"code": code, "message": message}}
+
+class CalcServer:
+    def __init__(self, jobs: int | None = None):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.stats = Stats()
+        self.pool = ProcessPoolExecutor(max_workers=self.jobs)
+        self.batcher = None
+
+    def _renew_pool(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.pool = ProcessPoolExecutor(max_workers=self.jobs)
+        return self.pool
+
+    async def _count(self, expr):
+        self.stats.exprs += 1
+        ok, val = await self.batcher.submit(expr)
+        if not ok:
+            self.stats.errors += 1
+        return ok, val
+
+    async def handle_request(self, req) -> dict | None:
+        if not isinstance(req, dict) or req.get("jsonrpc") != "2.0" or "method" not in req:
+            return _error(None, -32600, "Invalid Request")
+        self.stats.requests += 1
+        resp = await self._call(req.get("id"), req["method"], req.get("params") or {})
+        return None if "id" not in req else resp       # notification: هیچ پاسخی، حتی خطا
+
+    async def _call(self, id_, method, params) -> dict:
+        try:
+            if method == "eval":
+                expr = params["expr"] if isinstance(params, dict) else params[0]
+                ok, val = await self._count(str(expr))
+                if not ok:
+                    return _error(id_, 1, val)
+                result = _json_value(val)
+            elif method == "eval_many":
+                exprs = params["exprs"] if isinstance(params, dict) else params
+                done = await asyncio.gather(*(self._count(str(e)) for e in exprs))
+                result = [{"result": _json_value(v)} if ok else {"error": v} for ok, v in done]
+            elif method == "stats":
+                result = self.stats.snapshot()
+            else:
+                return _error(id_, -32601, "Method not found")
+        except (KeyError, IndexError, TypeError):
+            return _error(id_, -32602, "Invalid params")
+        return {"jsonrpc": "2.0", "id": id_, "result": result}
+
+    async def handle_line(self, line: bytes):
+        try:
+            msg = json.loads(line)
+        except ValueError:
+            return _error(None, -32700, "Parse error")
+        if isinstance(msg, list):                         # batch استاندارد JSON-RPC
+            if not msg:
+                return _error(None, -32600, "Invalid Request")
+            out = [r for r in await asyncio.gather(*(self.handle_request(m) for m in msg)) if r]
+            return out or None
+        return await self.handle_request(msg)
+
+    async def handle_conn(self, reader, writer):
+        """اتصال پایدار؛ هر خط جدا پردازش می‌شود تا درخواست‌های پشت‌سرهم هم‌زمان شوند"""
+        tasks = set()
+
+        async def one(line):
+            resp = await self.handle_line(line)
+            if resp is not None:
+                writer.write(_dumps(resp))
+                await writer.drain()
+
+        try:
+            while True:
+                line, too_long = await _read_line(reader)
+                if too_long:
+                    writer.write(_dumps(_error(None, -32600, "Invalid Request: message too long")))
+                    continue
+                if not line:
+                    break
+                if line.strip():
+                    t = asyncio.create_task(one(line))
+                    tasks.add(t)
+                    t.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=HOST, port=PORT, unix=None, ready=None):
+        self.batcher = Batcher(self.pool, self.jobs, self.stats, renew=self._renew_pool)
+        batch_task = asyncio.create_task(self.batcher.run())
+        if unix:
+            server = await asyncio.start_unix_server(self.handle_conn, path=unix, limit=LINE_LIMIT)
+        else:
+            server = await asyncio.start_server(self.handle_conn, host, port, limit=LINE_LIMIT)
+        if ready is not None:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batch_task.cancel()
+            self.pool.shutdown(cancel_futures=True)
+
+# ----------------------- کلاینت ساده (مسدودکننده) -----------------------
+class CalcClient:
+    def __init__(self, host=HOST, port=PORT, unix=None, timeout=10.0):
+        if unix:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(unix)
+        else:
+            self.sock = socket.create_connection((host, port))
+        self.sock.settimeout(timeout)
+        self.file = self.sock.makefile("rwb")
+        self._id = 0
+
+    def call(self, method, params=None):
+        self._id += 1
+        msg = {"jsonrpc": "2.0", "id": self._id, "method": method, "params": params or {}}
+        self.file.write(json.dumps(msg).encode() + b"\n")
+        self.file.flush()
+        resp = json.loads(self.file.readline())
+        if "error" in resp:
+            raise ValueError(resp["error"]["message"])
+        return resp["result"]
+
+    def eval(self, expr: str):
+        return self.call("eval", {"expr": expr})
+
+    def eval_many(self, exprs):
+        return self.call("eval_many", {"exprs": list(exprs)})
+
+    def stats(self) -> dict:
+        return self.call("stats")
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="calc_server", description="سرور محلی JSON-RPC ارزیابی")
+    p.add_argument("--host", default=HOST)
+    p.add_argument("--port", type=int, default=PORT)
+    p.add_argument("--unix", help="مسیر سوکت یونیکس (به جای TCP)")
+    p.add_argument("--jobs", "-j", type=int, help="تعداد پروسه‌های کارگر (پیش‌فرض: تعداد هسته‌ها)")
+    args = p.parse_args(argv)
+    try:
+        asyncio.run(CalcServer(args.jobs).serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ارزیابی در پروسه‌ی جدا با سقف زمان و حافظه (بدون Qt)
+# پروسه‌ی کارگر از قبل راه‌اندازی می‌شود؛ اگر ارزیابی از سقف زمان بگذرد
+# پروسه kill می‌شود و بلافاصله یک کارگر تازه جایش را می‌گیرد.
+
+import time
+import multiprocessing as mp
+
+from calc_engine import safe_eval, profiled_eval, FLOAT, DECIMAL_PREC
+
+EVAL_TIMEOUT = 2.0                   # ثانیه
+MEMORY_LIMIT = 1024 * 1024 * 1024    # بایت (فقط جایی که resource هست)
+
+def _limit_memory():
+    try:
+        import resource
+    except ImportError:              # ویندوز
+        return
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (MEMORY_LIMIT, MEMORY_LIMIT))
+    except (ValueError, OSError):
+        pass
+
+def _worker_main(conn):
+    """حلقه‌ی پروسه‌ی کارگر: (expr, profile, متغیرها، حالت عددی، دقت) می‌گیرد،
+    (ok, نتیجه یا پیام خطا، زمان‌ها) برمی‌گرداند"""
+    _limit_memory()
+    while True:
+        try:
+            expr, profile, variables, mode, precision = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        try:
+            if profile:
+                conn.send((True, *profiled_eval(expr, variables, mode, precision)))
+            else:
+                conn.send((True, safe_eval(expr, variables, mode, precision), None))
+        except Exception as e:
+            conn.send((False, str(e) or type(e).__name__, None))
+
+class EvalBackend:
+    def __init__(self, timeout: float = EVAL_TIMEOUT):
+        self.timeout = timeout
+        self._ctx = mp.get_context("spawn")    # fork از داخل برنامه‌ی Qt امن نیست
+        self._proc = self._conn = None
+        self._deadline = None
+        self.timings = None                    # زمان مراحل آخرین ارزیابی (اگر profile خواسته شده بود)
+        self._start()
+
+    def _start(self):
+        parent, child = self._ctx.Pipe()
+        self._proc = self._ctx.Process(target=_worker_main, args=(child,), daemon=True)
+        self._proc.start()
+        child.close()
+        self._conn = parent
+
+    def _restart(self):
+        self._proc.kill()
+        self._proc.join()
+        self._conn.close()
+        self._deadline = None
+        self._start()
+
+    @property
+    def busy(self) -> bool:
+        return self._deadline is not None
+
+    def submit(self, expr: str, profile: bool = False, variables=None,
+               mode: str = FLOAT, precision: int = DECIMAL_PREC):
+        """ارسال بدون انتظار؛ نتیجه با poll گرفته می‌شود"""
+        if self.busy:
+            raise RuntimeError("ارزیابی قبلی هنوز تمام نشده")
+        if not self._proc.is_alive():
+            self._restart()
+        self.timings = None
+        job = (expr, profile, variables, mode, precision)
+        try:
+            self._conn.send(job)
+        except (ConnectionError, EOFError):      # کارگر همین حالا از بین رفت
+            self._restart()
+            self._conn.send(job)
+        self._deadline = time.monotonic() + self.timeout
+
+    def poll(self):
+        """None تا وقتی کار ادامه دارد؛ سپس (ok, نتیجه یا پیام خطا)"""
+        if self._deadline is None:
+            return None
+        try:
+            ready = self._conn.poll()
+            res = self._conn.recv() if ready else None
+        except (EOFError, ConnectionError):      # ConnectionReset / BrokenPipe هم
+            self._restart()
+            return False, "پروسه‌ی ارزیابی متوقف شد"
+        if ready:
+            self._deadline = None
+            ok, val, self.timings = res
+            return ok, val
+        if not self._proc.is_alive():
+            self._restart()
+            return False, "پروسه‌ی ارزیابی متوقف شد"
+        if time.monotonic() > self._deadline:
+            self._restart()
+            return False, f"ارزیابی بیش از {self.timeout:g} ثانیه طول کشید و متوقف شد"
+        return None
+
+    def evaluate(self, expr: str):
+        """نسخه‌ی مسدودکننده برای استفاده‌ی بدون رابط گرافیکی"""
+        self.submit(expr)
+        while True:
+            try:
+                self._conn.poll(max(0.0, self._deadline - time.monotonic()))
+            except (EOFError, ConnectionError):
+                pass                    # poll پایین همان خطا را می‌گیرد و کارگر را از نو می‌سازد
+            res = self.poll()
+            if res is not None:
+                ok, val = res
+                if not ok:
+                    raise ValueError(val)
+                return val
+
+    def close(self):
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.join()
+            self._conn.close()
+            self._proc = None
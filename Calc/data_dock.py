@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# داک حالت داده: آمار یک ستون عدد از فایل یا کلیپ‌بورد
+# بارگذاری در QThreadPool انجام می‌شود و پیشرفت با سیگنال می‌آید، پس رابط
+# هنگام خواندن فایل‌های بزرگ قفل نمی‌شود. دوبار کلیک روی هر ردیف، مقدارش را
+# در نمایشگر ماشین‌حساب می‌گذارد.
+
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtWidgets import (QWidget, QDockWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                             QSpinBox, QLabel, QProgressBar, QListWidget, QFileDialog,
+                             QApplication)
+
+from calc_engine import num
+from calc_data import load_file, load_text
+
+class _LoadSignals(QObject):
+    progress = pyqtSignal(int)          # 0..1000
+    done = pyqtSignal(object, object)   # (کار، ColumnStats)
+    failed = pyqtSignal(object, str)
+
+class _LoadTask(QRunnable):
+    def __init__(self, load, source, column, signals):
+        super().__init__()
+        self.load, self.source, self.column = load, source, column
+        self.signals = signals
+        self.cancel = False
+
+    def run(self):
+        try:
+            stats = self.load(self.source, self.column,
+                              lambda p: self.signals.progress.emit(int(p * 1000)),
+                              lambda: self.cancel)
+        except (OSError, UnicodeError) as e:
+            self.signals.failed.emit(self, str(e))
+            return
+        self.signals.done.emit(self, stats)
+
+class DataDock(QDockWidget):
+    def __init__(self, use_value, parent=None):
+        super().__init__("Data", parent)
+        self.use_value = use_value      # use_value(text): گذاشتن مقدار در نمایشگر
+        self._task = None
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._signals = _LoadSignals(self)
+        self._signals.progress.connect(lambda v: self.bar.setValue(v))
+        self._signals.done.connect(self._show)
+        self._signals.failed.connect(self._fail)
+
+        body = QWidget()
+        lay = QVBoxLayout(body)
+        row = QHBoxLayout()
+        load_btn = QPushButton("File…")
+        load_btn.clicked.connect(self.load_file)
+        paste_btn = QPushButton("Paste")
+        paste_btn.clicked.connect(self.load_clipboard)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self.cancel)
+        self.cancel_btn.setEnabled(False)
+        self.column = QSpinBox()
+        self.column.setRange(0, 999)
+        self.column.setSpecialValueText("all")   # 0 = همه‌ی توکن‌ها؛ n = ستون n
+        self.column.setToolTip("ستون (all = همه‌ی عددها)")
+        row.addWidget(load_btn)
+        row.addWidget(paste_btn)
+        row.addWidget(self.column)
+        row.addWidget(self.cancel_btn)
+
+        self.bar = QProgressBar()
+        self.bar.setRange(0, 1000)
+        self.bar.setTextVisible(False)
+        self.results = QListWidget()
+        self.results.itemDoubleClicked.connect(
+            lambda item: self.use_value(item.data(Qt.ItemDataRole.UserRole)))
+        self.status = QLabel("")
+        lay.addLayout(row)
+        lay.addWidget(self.bar)
+        lay.addWidget(self.results, 1)
+        lay.addWidget(self.status)
+        self.setWidget(body)
+
+    def _start(self, load, source):
+        self.cancel()
+        col = self.column.value()
+        self._task = _LoadTask(load, source, col - 1 if col else None, self._signals)
+        self.bar.setValue(0)
+        self.status.setText("در حال خواندن…")
+        self.cancel_btn.setEnabled(True)
+        self._pool.start(self._task)
+
+    def load_file(self):
+        path, _ = QFileDialog.getOpenFileName(self, "فایل اعداد", "", "Text (*.txt *.csv *.tsv);;All (*)")
+        if path:
+            self._start(load_file, path)
+
+    def load_clipboard(self, text=None):
+        text = text if isinstance(text, str) else QApplication.clipboard().text()
+        if text.strip():
+            self._start(load_text, text)
+
+    def cancel(self):
+        if self._task is not None:
+            self._task.cancel = True
+            self._task = None
+        self.cancel_btn.setEnabled(False)
+
+    def _show(self, task, stats):
+        if task is not self._task:
+            return                      # لغوشده یا جایگزین‌شده
+        self.cancel_btn.setEnabled(False)
+        self._task = None
+        self.bar.setValue(1000)
+        self.results.clear()
+        for k, v in stats.summary().items():
+            text = str(v) if isinstance(v, int) else num(v)
+            self.results.addItem(f"{k:<6} {text}")
+            self.results.item(self.results.count() - 1).setData(Qt.ItemDataRole.UserRole, text)
+        note = "" if stats.exact is not None else " • صدک‌ها تقریبی (±0.1%)"
+        skipped = f" • {stats.skipped} مورد غیرعددی" if stats.skipped else ""
+        self.status.setText(f"{stats.n:,} عدد{skipped}{note}")
+
+    def _fail(self, task, msg):
+        if task is not self._task:
+            return
+        self.cancel_btn.setEnabled(False)
+        self._task = None
+        self.status.setText(f"خطا: {msg}")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ایندکس جستجوی تاریخچه (بدون Qt)
+#   متن : ایندکس سه‌حرفی (trigram) روی عبارت‌ها؛ کاندیدها با زیررشته تأیید می‌شوند
+#   عدد : فهرست مرتب (نتیجه، شماره) برای جستجوی بازه با bisect
+# با هر ارزیابی فقط add (و اگر تاریخچه پر بود drop_oldest) صدا زده می‌شود؛
+# ساخت کامل فقط یک بار (build) لازم است.
+#
+# شماره‌ی بیرونی = جایگاه در تاریخچه (0 = قدیمی‌ترین)؛ داخل ایندکس شماره =
+# جایگاه + _dead. drop_oldest فقط _dead را زیاد می‌کند و موردهای مرده در
+# جستجو کنار می‌روند؛ وقتی تعدادشان از زنده‌ها بیشتر شد یک‌جا پاک می‌شوند
+# (هزینه‌ی سرشکن O(1) برای هر حذف).
+
+import math, re
+from bisect import bisect_left, bisect_right, insort
+from operator import itemgetter
+
+# "a..b" ، "..b" یا "a.." → بازه‌ی نتیجه
+_RANGE = re.compile(r"^\s*([-+]?[\d.eE+-]*)\s*\.\.\s*([-+]?[\d.eE+-]*)\s*$")
+
+def _as_float(v) -> float:
+    try:
+        return float(v)
+    except OverflowError:
+        return math.inf if v > 0 else -math.inf
+    except (TypeError, ValueError):                # خلاصه‌ی آرایه
+        return math.nan
+
+def _grams(text: str):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class HistoryIndex:
+    def __init__(self):
+        self._texts: list[str] = []                  # عبارت‌ها (حروف کوچک)، به ترتیب شماره
+        self._grams: dict[str, list[int]] = {}       # trigram → شماره‌ها (صعودی)
+        self._results: list[tuple[float, int]] = []  # (نتیجه، شماره) مرتب
+        self._values: list[float] = []               # نتیجه به ترتیب شماره
+        self._dead = 0                               # موردهای حذف‌شده‌ی ابتدای فهرست‌ها
+
+    @classmethod
+    def build(cls, history):
+        """ساخت یک‌باره از هر منبع با len و اندیس (0 = قدیمی‌ترین)"""
+        idx = cls()
+        results = idx._results
+        for i in range(len(history)):
+            expr, res = history[i]
+            idx._add_text(i, expr)
+            v = _as_float(res)
+            idx._values.append(v)
+            if v == v:
+                results.append((v, i))
+        results.sort()                               # یک مرتب‌سازی به جای n بار insort
+        return idx
+
+    def _add_text(self, i: int, expr: str):
+        text = expr.lower()
+        self._texts.append(text)
+        grams = self._grams
+        for g in _grams(text):
+            grams.setdefault(g, []).append(i)
+
+    def add(self, i: int, expr: str, result):
+        i += self._dead
+        self._add_text(i, expr)
+        item = (_as_float(result), i)
+        self._values.append(item[0])
+        if item[0] != item[0]:                       # nan در جستجوی بازه شرکت نمی‌کند
+            return
+        if not self._results or item >= self._results[-1]:
+            self._results.append(item)
+        else:
+            insort(self._results, item)
+
+    def drop_oldest(self):
+        """حذف قدیمی‌ترین مورد (مثل بافر حلقوی تاریخچه)؛ شماره‌ی بقیه یکی کم می‌شود"""
+        self._dead += 1
+        if self._dead > max(len(self), 64):
+            self._compact()
+
+    def _compact(self):
+        dead = self._dead
+        self._texts = self._texts[dead:]
+        self._values = self._values[dead:]
+        grams = {}
+        for g, ids in self._grams.items():
+            k = bisect_left(ids, dead)                   # مرده‌ها همیشه ابتدای فهرست‌اند
+            if k < len(ids):
+                grams[g] = [i - dead for i in ids[k:]]
+        self._grams = grams
+        self._results = [(v, i - dead) for v, i in self._results if i >= dead]   # ترتیب همان می‌ماند
+        self._dead = 0
+
+    def __len__(self):
+        return len(self._texts) - self._dead
+
+    # --- جستجو (خروجی: شماره‌ها، جدیدترین اول) ---
+    def search_text(self, q: str) -> list[int]:
+        q = q.lower()
+        texts, dead = self._texts, self._dead
+        if len(q) < 3:                               # پرس‌وجوی کوتاه: پیمایش ساده
+            return [i - dead for i in range(len(texts) - 1, dead - 1, -1) if q in texts[i]]
+        ids = min((self._grams.get(g, ()) for g in _grams(q)), key=len)
+        start = bisect_left(ids, dead)
+        return [ids[k] - dead for k in range(len(ids) - 1, start - 1, -1) if q in texts[ids[k]]]
+
+    def search_range(self, lo=-math.inf, hi=math.inf) -> list[int]:
+        a = bisect_left(self._results, (lo, -1))
+        b = bisect_right(self._results, (hi, math.inf))
+        vals, dead = self._values, self._dead
+        if (b - a) * 8 > len(vals):
+            # بازه‌ی پهن: پیمایش مستقیم ارزان‌تر از مرتب کردن شماره‌هاست
+            return [i - dead for i in range(len(vals) - 1, dead - 1, -1) if lo <= vals[i] <= hi]
+        ids = [i - dead for i in map(itemgetter(1), self._results[a:b]) if i >= dead]
+        ids.sort(reverse=True)
+        return ids
+
+    def search(self, query: str) -> list[int]:
+        """"a..b" (یک طرف اختیاری) = بازه‌ی نتیجه؛ هر چیز دیگر = زیررشته‌ی عبارت"""
+        m = _RANGE.match(query)
+        if m:
+            try:
+                lo = float(m.group(1)) if m.group(1) else -math.inf
+                hi = float(m.group(2)) if m.group(2) else math.inf
+                return self.search_range(lo, hi)
+            except ValueError:
+                pass
+        return self.search_text(query.strip())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# مدل تاریخچه برای QListView – بافر حلقوی با ظرفیت ثابت
+# هر ارزیابی فقط یک سطر (بالای لیست) اضافه می‌کند و در صورت پر بودن
+# قدیمی‌ترین سطر حذف می‌شود؛ متن هر سطر فقط هنگام نمایش ساخته می‌شود.
+# با set_source می‌توان تاریخچه‌ی ذخیره‌شده (HistoryStore) را وصل کرد تا
+# موارد قدیمی‌تر هنگام اسکرول (fetchMore) صفحه‌به‌صفحه خوانده شوند.
+# set_filter فهرست شماره‌های نتیجه‌ی جستجو را نمایش می‌دهد (باز هم تنبل).
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+class HistoryModel(QAbstractListModel):
+    PAGE = 200     # تعداد رکورد قدیمی در هر fetchMore
+
+    def __init__(self, fmt, capacity: int = 100_000, parent=None):
+        super().__init__(parent)
+        self._fmt = fmt                  # تابع نمایش عدد (مثل Calc._num)
+        self._cap = capacity
+        self._buf = [None] * capacity    # بافر حلقوی (expr, result)
+        self._start = 0                  # اندیس قدیمی‌ترین مورد
+        self._len = 0
+        self._source = None              # منبع موارد قدیمی‌تر (مثل HistoryStore)
+        self._older = 0                  # تعداد موارد قدیمی‌ترِ هنوز خوانده‌نشده
+        self._filter = None              # شماره‌ها در source (جدیدترین اول) یا None
+
+    def set_source(self, source):
+        """source: هر شیء با len و اندیس‌گذاری (0 = قدیمی‌ترین)"""
+        self.beginResetModel()
+        self._source = source
+        self._older = len(source)
+        self.endResetModel()
+
+    def source_evicted(self, n: int = 1):
+        """قدیمی‌ترین n مورد source حذف شده‌اند؛ موارد خوانده‌نشده هم n تا جلو آمده‌اند"""
+        self._older = max(0, self._older - n)
+
+    def set_filter(self, ids):
+        """ids: شماره‌های source برای نمایش (جدیدترین اول)؛ None = همه"""
+        self.beginResetModel()
+        self._filter = ids
+        self.endResetModel()
+
+    # --- رابط مدل ---
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._len if self._filter is None else len(self._filter)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        expr, res = self.entry(index.row())
+        return f"{expr} = {self._fmt(res)}"
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return (not parent.isValid() and self._filter is None
+                and self._older > 0 and self._len < self._cap)
+
+    def fetchMore(self, parent=QModelIndex()):
+        n = min(self.PAGE, self._older, self._cap - self._len)
+        if parent.isValid() or n <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._len, self._len + n - 1)
+        for _ in range(n):
+            self._older -= 1
+            self._start = (self._start - 1) % self._cap
+            self._buf[self._start] = self._source[self._older]
+            self._len += 1
+        self.endInsertRows()
+
+    # --- دسترسی و افزودن ---
+    def entry(self, row: int) -> tuple[str, float]:
+        """سطر 0 = جدیدترین مورد"""
+        if self._filter is not None:
+            return self._source[self._filter[row]]
+        return self._buf[(self._start + self._len - 1 - row) % self._cap]
+
+    def append(self, expr: str, result: float):
+        shown = self._filter is None     # در حالت جستجو سطرها تغییری نمی‌کنند
+        if self._len == self._cap:
+            # حذف قدیمی‌ترین (آخرین سطر)
+            if shown:
+                self.beginRemoveRows(QModelIndex(), self._len - 1, self._len - 1)
+            self._buf[self._start] = None
+            self._start = (self._start + 1) % self._cap
+            self._len -= 1
+            if shown:
+                self.endRemoveRows()
+        if shown:
+            self.beginInsertRows(QModelIndex(), 0, 0)
+        self._buf[(self._start + self._len) % self._cap] = (expr, result)
+        self._len += 1
+        if shown:
+            self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._buf = [None] * self._cap
+        self._start = self._len = 0
+        self._older = 0
+        self._filter = None
+        self.endResetModel()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# ذخیره‌ی دائمی تاریخچه روی دیسک (بدون Qt)
+#   history.log : لاگ فقط‌افزودنی، هر رکورد یک خط "expr<TAB>result"
+#   history.idx : offset شروع هر رکورد در لاگ (uint64، little-endian)
+# هر ارزیابی = یک افزودن به انتهای دو فایل. خواندن از طریق mmap روی ایندکس
+# انجام می‌شود، پس فقط رکوردهایی که واقعاً لازم‌اند از دیسک خوانده می‌شوند.
+
+import os, mmap, struct
+
+HISTORY_DIR = os.path.join(os.path.expanduser("~"), ".simplecalc")
+
+_OFF = struct.Struct("<Q")
+_SCAN_BLOCK = 64 * 1024     # اندازه‌ی بلوک پیمایش رو به عقب در _repair
+
+# عدد صحیح بزرگ‌تر به صورت hex نوشته می‌شود (تبدیل به متن دهدهی سقف ۴۳۰۰ رقم دارد)
+_BIG_INT_BITS = 10_000
+
+def _int_text(n: int) -> str:
+    return hex(n) if n.bit_length() > _BIG_INT_BITS else str(n)
+
+def _encode(expr: str, result) -> bytes:
+    expr = expr.replace("\t", " ").replace("\r", " ").replace("\n", " ")
+    if isinstance(result, str):
+        res = result                                    # خلاصه‌ی آرایه متن است
+    elif type(result) is int:
+        res = _int_text(result)
+    elif hasattr(result, "as_tuple"):                   # Decimal با همه‌ی ارقامش
+        res = f"decimal:{result}"
+    elif hasattr(result, "denominator"):                # Fraction
+        res = f"fraction:{_int_text(result.numerator)}/{_int_text(result.denominator)}"
+    else:
+        res = repr(result)
+    return f"{expr}\t{res}\n".encode("utf-8")
+
+def _decode(rec: bytes) -> tuple[str, object]:
+    expr, _, res = rec.decode("utf-8").rstrip("\n").rpartition("\t")
+    if res.startswith("decimal:"):
+        from decimal import Decimal
+        return expr, Decimal(res[8:])
+    if res.startswith("fraction:"):
+        from fractions import Fraction
+        num, _, den = res[9:].partition("/")
+        return expr, Fraction(int(num, 0), int(den, 0))
+    try:
+        return expr, int(res, 0)                        # دهدهی یا 0x…
+    except ValueError:
+        pass
+    try:
+        return expr, float(res)
+    except ValueError:
+        return expr, res
+
+def _last_newline(f, end: int) -> int:
+    """جای آخرین پایان خط پیش از end (یا -1)؛ از انتها بلوک‌به‌بلوک، بدون خواندن کل فایل"""
+    while end > 0:
+        start = max(0, end - _SCAN_BLOCK)
+        f.seek(start)
+        i = f.read(end - start).rfind(b"\n")
+        if i >= 0:
+            return start + i
+        end = start
+    return -1
+
+class HistoryStore:
+    def __init__(self, path: str | None = None):
+        self.path = path or HISTORY_DIR
+        os.makedirs(self.path, exist_ok=True)
+        self._log_path = os.path.join(self.path, "history.log")
+        self._idx_path = os.path.join(self.path, "history.idx")
+        self._repair()
+
+        self._log = open(self._log_path, "ab")
+        self._idx = open(self._idx_path, "ab")
+        self._log_size = self._log.seek(0, os.SEEK_END)
+        self._count = self._idx.seek(0, os.SEEK_END) // _OFF.size
+
+        # mmapها تنبل ساخته می‌شوند و فقط وقتی رکورد جدیدتری لازم باشد تمدید
+        self._idx_map = self._log_map = None
+        self._mapped = 0
+
+    # --- سازگاری لاگ و ایندکس (مثلاً بعد از قطع ناگهانی برنامه) ---
+    def _repair(self):
+        if not os.path.exists(self._log_path):
+            open(self._log_path, "wb").close()
+            open(self._idx_path, "wb").close()
+            return
+        with open(self._log_path, "r+b") as log:
+            size = log.seek(0, os.SEEK_END)
+            if size:
+                # رکورد نیمه‌کاره‌ی آخر را دور می‌ریزیم
+                log.seek(max(0, size - 1))
+                if log.read(1) != b"\n":
+                    size = _last_newline(log, size) + 1
+                    log.truncate(size)
+            idx_size = os.path.getsize(self._idx_path) if os.path.exists(self._idx_path) else -1
+            if idx_size >= 0 and idx_size % _OFF.size == 0:
+                if idx_size == 0 and size == 0:
+                    return
+                if idx_size:
+                    with open(self._idx_path, "rb") as idx:
+                        idx.seek(idx_size - _OFF.size)
+                        (last,) = _OFF.unpack(idx.read(_OFF.size))
+                    log.seek(last)
+                    if last < size and len(log.readline()) == size - last:
+                        return
+            # بازسازی ایندکس با یک پیمایش کامل لاگ
+            log.seek(0)
+            with open(self._idx_path, "wb") as idx:
+                pos = 0
+                for line in log:
+                    idx.write(_OFF.pack(pos))
+                    pos += len(line)
+
+    def _remap(self):
+        self._close_maps()
+        if self._count:
+            with open(self._idx_path, "rb") as f:
+                self._idx_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            with open(self._log_path, "rb") as f:
+                self._log_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped = self._count
+
+    def _close_maps(self):
+        for m in (self._idx_map, self._log_map):
+            if m is not None:
+                m.close()
+        self._idx_map = self._log_map = None
+
+    # --- رابط عمومی ---
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i: int) -> tuple[str, float]:
+        """رکورد i (0 = قدیمی‌ترین، منفی از انتها)"""
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("history index out of range")
+        if i >= self._mapped:
+            self._remap()
+        start = _OFF.unpack_from(self._idx_map, i * _OFF.size)[0]
+        if i + 1 < self._mapped:
+            end = _OFF.unpack_from(self._idx_map, (i + 1) * _OFF.size)[0]
+        else:
+            end = len(self._log_map)
+        return _decode(self._log_map[start:end])
+
+    def tail(self, n: int) -> list[tuple[str, float]]:
+        """n رکورد آخر (قدیمی → جدید)"""
+        return [self[i] for i in range(max(0, self._count - n), self._count)]
+
+    def append(self, expr: str, result):
+        rec = _encode(expr, result)
+        self._log.write(rec)
+        self._log.flush()
+        self._idx.write(_OFF.pack(self._log_size))
+        self._idx.flush()
+        self._log_size += len(rec)
+        self._count += 1
+
+    def close(self):
+        self._close_maps()
+        self._log.close()
+        self._idx.close()
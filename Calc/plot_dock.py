@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# داک رسم نمودار f(x) با همان توابع مجاز ماشین‌حساب
+# نمونه‌برداری تطبیقی: جایی که منحنی خم دارد نقطه‌ی بیشتر، جای صاف نقطه‌ی کمتر.
+# همه‌ی نقاط جدید هر فریم در یک فراخوانی برداری (batch_eval) حساب می‌شوند و
+# نمونه‌ها کش می‌شوند؛ با جابه‌جایی/زوم فقط بازه‌ی تازه‌پیداشده حساب می‌شود.
+# اگر پالایش هنوز تمام نشده باشد، فریم بعدی ادامه‌اش می‌دهد.
+
+import numpy as np
+from PyQt6.QtCore import Qt, QPointF, QTimer
+from PyQt6.QtGui import QPainter, QPen, QColor, QPolygonF
+from PyQt6.QtWidgets import (QWidget, QDockWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
+                             QLabel, QPushButton)
+
+from calc_engine import batch_eval, solve, num
+
+# ----------------------- نمونه‌بردار (بدون وابستگی به ویجت) -----------------------
+class PlotSampler:
+    BASE_N = 400            # حداقل تعداد نقطه در عرض دید
+    TOL = 0.002             # آستانه‌ی انحنا (نسبت به ارتفاع دید)
+    MIN_FRAC = 1 / 8192     # کوچک‌ترین فاصله‌ی دو نقطه نسبت به عرض دید
+    MAX_NEW = 4096          # سقف نقاط جدید در هر فریم
+    MAX_SAMPLES = 200_000   # سقف کش؛ بیش از آن نقاط دور از دید دور ریخته می‌شوند
+
+    def __init__(self, func):
+        self.func = func                # func(xs: ndarray) -> ys: ndarray
+        self.xs = np.empty(0)
+        self.ys = np.empty(0)
+
+    def _missing_base(self, x0, x1):
+        """نقاط شبکه‌ی پایه (هم‌تراز با مضرب‌های step) که نمونه‌ی نزدیکی ندارند"""
+        step = (x1 - x0) / self.BASE_N
+        ks = np.arange(np.floor(x0 / step) - 1, np.ceil(x1 / step) + 2)
+        grid = ks * step
+        if not len(self.xs):
+            return grid
+        i = np.clip(np.searchsorted(self.xs, grid), 1, len(self.xs) - 1)
+        near = np.minimum(np.abs(self.xs[i] - grid), np.abs(self.xs[i - 1] - grid))
+        return grid[near > step / 2]
+
+    def _curvy(self, x0, x1, y0, y1):
+        """وسط بازه‌هایی که نقطه‌ی میانی از وتر فاصله‌ی زیادی دارد (یا لبه‌ی nan است)"""
+        lo = max(0, np.searchsorted(self.xs, x0) - 1)
+        hi = min(len(self.xs), np.searchsorted(self.xs, x1) + 1)
+        xs, ys = self.xs[lo:hi], self.ys[lo:hi]
+        if len(xs) < 3:
+            return np.empty(0)
+        xa, xb, xc = xs[:-2], xs[1:-1], xs[2:]
+        ya, yb, yc = ys[:-2], ys[1:-1], ys[2:]
+        with np.errstate(all="ignore"):
+            chord = ya + (yc - ya) * (xb - xa) / (xc - xa)
+            dev = np.abs(yb - chord) / (y1 - y0)
+        fin = np.isfinite(ya) & np.isfinite(yb) & np.isfinite(yc)
+        bad = np.where(fin, dev > self.TOL, fin != (np.isfinite(ya) | np.isfinite(yc)))
+        bad &= (xc - xa) > (x1 - x0) * self.MIN_FRAC
+        return np.concatenate(((xa[bad] + xb[bad]) / 2, (xb[bad] + xc[bad]) / 2))
+
+    def update(self, x0, x1, y0, y1) -> bool:
+        """یک گام نمونه‌برداری برای دید فعلی؛ True یعنی پالایش بیشتری لازم است"""
+        new = self._missing_base(x0, x1)
+        if len(self.xs):
+            new = np.concatenate((new, self._curvy(x0, x1, y0, y1)))
+        new = np.unique(new)
+        if not len(new):
+            return False
+        pending = len(new) > self.MAX_NEW
+        new = new[:self.MAX_NEW]
+        ys = np.asarray(self.func(new), dtype=np.float64)    # یک فراخوانی برای کل فریم
+        i = np.searchsorted(self.xs, new)
+        self.xs = np.insert(self.xs, i, new)
+        self.ys = np.insert(self.ys, i, ys)
+        if len(self.xs) > self.MAX_SAMPLES:
+            w = x1 - x0
+            keep = (self.xs > x0 - w) & (self.xs < x1 + w)
+            self.xs, self.ys = self.xs[keep], self.ys[keep]
+        return True if pending else len(self._curvy(x0, x1, y0, y1)) > 0
+
+    def visible(self, x0, x1):
+        lo = max(0, np.searchsorted(self.xs, x0) - 1)
+        hi = min(len(self.xs), np.searchsorted(self.xs, x1) + 1)
+        return self.xs[lo:hi], self.ys[lo:hi]
+
+# ----------------------- ویجت نمودار -----------------------
+class PlotWidget(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumSize(320, 240)
+        self.x0, self.x1 = -10.0, 10.0
+        self.y0, self.y1 = -5.0, 5.0
+        self.sampler = None
+        self._autofit = False
+        self._drag = None
+
+    def set_function(self, func):
+        self.sampler = PlotSampler(func) if func else None
+        self._autofit = True
+        self.update()
+
+    def _fit_y(self):
+        _, ys = self.sampler.visible(self.x0, self.x1)
+        ys = ys[np.isfinite(ys)]
+        if not len(ys):
+            return
+        lo, hi = np.percentile(ys, [2, 98])
+        if hi - lo < 1e-12:
+            lo, hi = lo - 1, hi + 1
+        pad = (hi - lo) * 0.1
+        self.y0, self.y1 = float(lo - pad), float(hi + pad)
+
+    def paintEvent(self, ev):
+        p = QPainter(self)
+        p.fillRect(self.rect(), QColor("#0f1117"))
+        W, H = self.width(), self.height()
+        sx = lambda x: (x - self.x0) / (self.x1 - self.x0) * W
+        sy = lambda y: H - (y - self.y0) / (self.y1 - self.y0) * H
+
+        # محورها
+        p.setPen(QPen(QColor("#202635"), 1))
+        if self.y0 < 0 < self.y1:
+            p.drawLine(QPointF(0, sy(0)), QPointF(W, sy(0)))
+        if self.x0 < 0 < self.x1:
+            p.drawLine(QPointF(sx(0), 0), QPointF(sx(0), H))
+
+        if self.sampler is not None:
+            pending = self.sampler.update(self.x0, self.x1, self.y0, self.y1)
+            if self._autofit:
+                self._autofit = False
+                self._fit_y()
+                pending = True
+            self._draw_curve(p, sx, sy, W, H)
+            if pending:
+                QTimer.singleShot(0, self.update)    # ادامه‌ی پالایش در فریم بعد
+        p.end()
+
+    def _draw_curve(self, p, sx, sy, W, H):
+        xs, ys = self.sampler.visible(self.x0, self.x1)
+        if len(xs) > 4 * W:                          # بیش از چند نقطه در هر پیکسل لازم نیست
+            step = len(xs) // (4 * W)
+            xs, ys = xs[::step], ys[::step]
+        px, py = sx(xs), sy(ys)
+        # شکستن منحنی در nan/inf و پرش‌های خیلی بزرگ (مثل مجانب tan)
+        ok = np.isfinite(py)
+        jump = np.zeros(len(py), dtype=bool)
+        jump[1:] = np.abs(np.diff(py)) > 2 * H
+        p.setPen(QPen(QColor("#7aa2ff"), 2))
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        run = []
+        for x, y, good, j in zip(px, py, ok, jump):
+            if not good or j:
+                if len(run) > 1:
+                    p.drawPolyline(QPolygonF(run))
+                run = [QPointF(x, y)] if good else []
+            else:
+                run.append(QPointF(x, y))
+        if len(run) > 1:
+            p.drawPolyline(QPolygonF(run))
+
+    # --- جابه‌جایی و زوم ---
+    def mousePressEvent(self, ev):
+        self._drag = ev.position()
+
+    def mouseMoveEvent(self, ev):
+        if self._drag is None:
+            return
+        d = ev.position() - self._drag
+        self._drag = ev.position()
+        dx = d.x() / self.width() * (self.x1 - self.x0)
+        dy = d.y() / self.height() * (self.y1 - self.y0)
+        self.x0 -= dx; self.x1 -= dx
+        self.y0 += dy; self.y1 += dy
+        self.update()
+
+    def mouseReleaseEvent(self, ev):
+        self._drag = None
+
+    def wheelEvent(self, ev):
+        k = 0.85 if ev.angleDelta().y() > 0 else 1 / 0.85
+        pos = ev.position()
+        cx = self.x0 + pos.x() / self.width() * (self.x1 - self.x0)
+        cy = self.y1 - pos.y() / self.height() * (self.y1 - self.y0)
+        self.x0, self.x1 = cx + (self.x0 - cx) * k, cx + (self.x1 - cx) * k
+        self.y0, self.y1 = cy + (self.y0 - cy) * k, cy + (self.y1 - cy) * k
+        self.update()
+
+# ----------------------- داک -----------------------
+class PlotDock(QDockWidget):
+    def __init__(self, variables=None, parent=None):
+        super().__init__("Plot", parent)
+        self.variables = variables or dict     # تابعی که متغیرهای عددی فعلی را می‌دهد
+        body = QWidget()
+        lay = QVBoxLayout(body)
+        self.expr = QLineEdit()
+        self.expr.setPlaceholderText("f(x) مثلاً sin(x)/x")
+        self.expr.returnPressed.connect(self.apply)
+        roots = QPushButton("Roots")
+        roots.setToolTip("ریشه‌های f(x) = 0 در بازه‌ی دیده‌شده")
+        roots.clicked.connect(self.find_roots)
+        self.status = QLabel("")
+        self.status.setWordWrap(True)
+        self.plot = PlotWidget()
+        row = QHBoxLayout()
+        row.addWidget(self.expr, 1)
+        row.addWidget(roots)
+        lay.addLayout(row)
+        lay.addWidget(self.plot, 1)
+        lay.addWidget(self.status)
+        self.setWidget(body)
+
+    def apply(self):
+        text = self.expr.text().strip()
+        if not text:
+            self.plot.set_function(None)
+            return
+        variables = self.variables()
+        try:
+            batch_eval(text, x=np.zeros(1), **variables)          # بررسی درستی عبارت
+        except Exception as e:
+            self.status.setText(f"عبارت نامعتبر: {e}")
+            return
+        self.status.setText("")
+        self.plot.set_function(lambda xs: batch_eval(text, x=xs, **variables))
+
+    def find_roots(self):
+        text = self.expr.text().strip()
+        if not text:
+            return
+        try:
+            roots = solve(text, "x", self.plot.x0, self.plot.x1, variables=self.variables())
+        except Exception as e:
+            self.status.setText(f"عبارت نامعتبر: {e}")
+            return
+        if not roots:
+            self.status.setText("ریشه‌ای در این بازه نیست")
+            return
+        shown = ", ".join(num(round(r, 12)) for r in roots[:12])
+        more = f" … (+{len(roots) - 12})" if len(roots) > 12 else ""
+        self.status.setText(f"x = {shown}{more}")
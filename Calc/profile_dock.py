@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# داک اشکال‌زدایی: جدول زمان مراحل ارزیابی از روی Profiler
+# فقط وقتی داک دیده می‌شود هر نیم ثانیه تازه می‌شود.
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import (QWidget, QDockWidget, QVBoxLayout, QHBoxLayout, QCheckBox,
+                             QPushButton, QPlainTextEdit, QFileDialog, QMessageBox)
+
+REFRESH_MS = 500
+
+class ProfileDock(QDockWidget):
+    def __init__(self, profiler, parent=None):
+        super().__init__("Profile", parent)
+        self.profiler = profiler
+        body = QWidget()
+        lay = QVBoxLayout(body)
+
+        row = QHBoxLayout()
+        self.enabled = QCheckBox("زمان‌سنجی")
+        self.enabled.setChecked(profiler.enabled)
+        self.enabled.toggled.connect(self._set_enabled)
+        reset = QPushButton("Reset")
+        reset.clicked.connect(self._reset)
+        dump = QPushButton("JSON…")
+        dump.clicked.connect(self._dump)
+        row.addWidget(self.enabled)
+        row.addStretch(1)
+        row.addWidget(reset)
+        row.addWidget(dump)
+
+        self.table = QPlainTextEdit()
+        self.table.setReadOnly(True)
+        self.table.setFont(QFont("monospace", 10))
+        lay.addLayout(row)
+        lay.addWidget(self.table, 1)
+        self.setWidget(body)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+        self.visibilityChanged.connect(self._on_visible)
+
+    def _on_visible(self, visible):
+        if visible:
+            self.refresh()
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    def _set_enabled(self, on):
+        self.profiler.enabled = on
+
+    def _reset(self):
+        self.profiler.reset()
+        self.refresh()
+
+    def _dump(self):
+        path, _ = QFileDialog.getSaveFileName(self, "ذخیره‌ی زمان‌ها", "calc_profile.json", "JSON (*.json)")
+        if not path:
+            return
+        try:
+            self.profiler.dump(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"ذخیره ممکن نشد:\n{e}")
+
+    def refresh(self):
+        self.table.setPlainText(self.profiler.report())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# داک جدول f(x): x = start + i*step برای میلیون‌ها سطر
+# مدل هیچ سطری را از قبل حساب نمی‌کند؛ وقتی نما سطری را می‌خواهد، کل صفحه‌ی
+# آن سطر (PAGE سطر) با یک batch_eval حساب و در کش LRU نگه داشته می‌شود.
+# حافظه به تعداد صفحه‌های کش بستگی دارد، نه به تعداد سطرها.
+
+from collections import OrderedDict
+
+import numpy as np
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtWidgets import (QWidget, QDockWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
+                             QLabel, QTableView, QHeaderView, QSpinBox)
+
+from calc_engine import batch_eval, num
+
+class FunctionTableModel(QAbstractTableModel):
+    PAGE = 256              # سطرهای هر محاسبه‌ی برداری
+    MAX_PAGES = 64          # سقف کش (حدود ۱۶ هزار سطر)
+    HEADERS = ("x", "f(x)")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.expr = ""
+        self.start, self.step, self.rows = 0.0, 1.0, 0
+        self.variables = {}
+        self._pages = OrderedDict()     # شماره‌ی صفحه → (xs, ys)
+
+    def configure(self, expr: str, start: float, step: float, rows: int, variables=None):
+        """تعریف جدول تازه؛ اگر عبارت نامعتبر باشد همین‌جا خطا می‌دهد"""
+        variables = dict(variables or {})
+        batch_eval(expr, x=np.zeros(1), **variables)          # بررسی درستی عبارت
+        self.beginResetModel()
+        self.expr, self.start, self.step, self.rows = expr, start, step, rows
+        self.variables = variables
+        self._pages.clear()
+        self.endResetModel()
+
+    def _page(self, p: int):
+        page = self._pages.get(p)
+        if page is not None:
+            self._pages.move_to_end(p)
+            return page
+        i = np.arange(p * self.PAGE, min(self.rows, (p + 1) * self.PAGE), dtype=np.float64)
+        xs = self.start + i * self.step                       # بدون خطای تجمعی جمع‌های پیاپی
+        try:
+            ys = batch_eval(self.expr, x=xs, **self.variables)
+        except Exception:
+            ys = np.full(len(xs), np.nan)
+        page = self._pages[p] = (xs, ys)
+        if len(self._pages) > self.MAX_PAGES:
+            self._pages.popitem(last=False)
+        return page
+
+    # --- رابط مدل ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        row = index.row()
+        xs, ys = self._page(row // self.PAGE)
+        return num(float((xs, ys)[index.column()][row % self.PAGE]))
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return str(section)
+
+class TableDock(QDockWidget):
+    def __init__(self, variables=None, parent=None):
+        super().__init__("Table", parent)
+        self.variables = variables or dict     # تابعی که متغیرهای عددی فعلی را می‌دهد
+        body = QWidget()
+        lay = QVBoxLayout(body)
+        self.expr = QLineEdit()
+        self.expr.setPlaceholderText("f(x) مثلاً x^2 + 1")
+        self.start = QLineEdit("0")
+        self.step = QLineEdit("1")
+        self.rows = QSpinBox()
+        self.rows.setRange(1, 2_000_000_000)
+        self.rows.setValue(10_000_000)
+        self.rows.setGroupSeparatorShown(True)
+        for w in (self.expr, self.start, self.step):
+            w.returnPressed.connect(self.apply)
+        row = QHBoxLayout()
+        row.addWidget(QLabel("start"))
+        row.addWidget(self.start)
+        row.addWidget(QLabel("step"))
+        row.addWidget(self.step)
+        row.addWidget(QLabel("rows"))
+        row.addWidget(self.rows)
+
+        self.model = FunctionTableModel(self)
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        # ارتفاع ثابت سطر: نما برای اسکرول به اندازه‌ی سطرها نیازی ندارد
+        vh = self.view.verticalHeader()
+        vh.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vh.setDefaultSectionSize(22)
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.status = QLabel("")
+        lay.addWidget(self.expr)
+        lay.addLayout(row)
+        lay.addWidget(self.view, 1)
+        lay.addWidget(self.status)
+        self.setWidget(body)
+
+    def apply(self):
+        text = self.expr.text().strip()
+        if not text:
+            return
+        try:
+            start, step = float(self.start.text()), float(self.step.text())
+            self.model.configure(text, start, step, self.rows.value(), self.variables())
+        except Exception as e:
+            self.status.setText(f"عبارت نامعتبر: {e}")
+            return
+        self.status.setText("")
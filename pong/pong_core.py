@@ -0,0 +1,242 @@
+# شبیه‌سازی Pong بدون pygame (بدون پنجره و فونت)؛ pong.py فقط همین وضعیت را رسم می‌کند
+# تصادف از random.Random(seed) هر بازی است، پس seed + ورودی‌ها = همان بازی
+#   python pong_core.py --steps 1000000 --seed 1
+import argparse
+import math
+import random
+import time
+from typing import NamedTuple
+
+# -------------------- Config --------------------
+WIDTH, HEIGHT = 900, 600
+WIN_SCORE = 10
+SIM_DT = 1 / 240          # گام ثابت شبیه‌سازی (ثانیه)، مستقل از FPS رسم
+
+PADDLE_W, PADDLE_H = 12, 100
+PADDLE_MARGIN = 30
+BALL_SIZE = 14
+
+PLAYER_SPEED = 420
+AI_BASE_SPEED = 360
+AI_REACTION = 0.20   # 0..1 (واکنش کندتر = آسان‌تر)
+
+BALL_SPEED = 480
+BALL_SPEED_GROWTH = 1.02  # افزایش سرعت بعد از هر برخورد با پدال
+MAX_BOUNCE_DEG = 50       # بیشینه زاویه انحراف (درجه)
+SERVE_TIME = 1.3          # شمارش معکوس سرویس (ثانیه)
+
+# رویدادهایی که step برمی‌گرداند
+NOTHING, HIT, PLAYER_POINT, CPU_POINT = 0, 1, 2, 3
+
+# -------------------- Helpers --------------------
+def clamp(x, lo, hi):
+    return max(lo, min(hi, x))
+
+def sign(x):
+    return -1 if x < 0 else 1
+
+# فرمان پدال‌ها در هر گام: -1 بالا، 0 ایست، +1 پایین، None = هوش مصنوعی
+class Inputs(NamedTuple):
+    player: int | None = 0
+    cpu: int | None = None
+
+# -------------------- Entities --------------------
+class Paddle:
+    __slots__ = ("x", "y", "speed")
+
+    def __init__(self, x, y):
+        self.x, self.y = float(x), float(y)   # گوشه‌ی بالا-چپ
+        self.speed = PLAYER_SPEED
+
+    @property
+    def centery(self):
+        return self.y + PADDLE_H / 2
+
+    @centery.setter
+    def centery(self, v):
+        self.y = v - PADDLE_H / 2
+
+    def move(self, dy, dt):
+        self.y = clamp(self.y + dy * self.speed * dt, 0.0, HEIGHT - PADDLE_H)
+
+    def ai_update(self, ball, dt, rng, difficulty=1.0):
+        # AI هدف می‌گیرد به نقطه پیش‌بینی‌شده با کمی تأخیر/لرزش
+        predict_y = ball.y + BALL_SIZE / 2 + (ball.vy * AI_REACTION / max(1e-3, abs(ball.vx))) * WIDTH
+        # کمی نویز برای طبیعی شدن
+        if difficulty != 1.0:
+            predict_y += rng.uniform(-40, 40) * (1.0 - difficulty)
+        # سرعت AI متناسب با سرعت توپ
+        ai_speed = (AI_BASE_SPEED + 0.25 * math.hypot(ball.vx, ball.vy)) * difficulty
+        cy = self.y + PADDLE_H / 2
+        if cy < predict_y - 12:
+            self.y = min(self.y + ai_speed * dt, HEIGHT - PADDLE_H)
+        elif cy > predict_y + 12:
+            self.y = max(self.y - ai_speed * dt, 0.0)
+
+class Ball:
+    __slots__ = ("x", "y", "vx", "vy", "serving", "serve_timer")
+
+    def __init__(self, rng):
+        self.reset(rng, direction=rng.choice((-1, 1)))
+
+    def reset(self, rng, direction=1):
+        self.x = (WIDTH - BALL_SIZE) / 2
+        self.y = (HEIGHT - BALL_SIZE) / 2
+        angle = math.radians(rng.uniform(-18, 18))  # سرویس با زاویه کم
+        self.vx = direction * BALL_SPEED * math.cos(angle)
+        self.vy = BALL_SPEED * math.sin(angle)
+        self.serving = True   # برای شمارش معکوس
+        self.serve_timer = SERVE_TIME
+
+    def update(self, dt):
+        if self.serving:
+            self.serve_timer -= dt
+            if self.serve_timer <= 0:
+                self.serving = False
+            return
+        self.x += self.vx * dt
+        y = self.y + self.vy * dt
+
+        # دیوار بالا/پایین
+        if y <= 0:
+            y = 0.0
+            self.vy = -self.vy
+        elif y >= HEIGHT - BALL_SIZE:
+            y = HEIGHT - BALL_SIZE
+            self.vy = -self.vy
+        self.y = y
+
+    def collide_paddle(self, paddle, prev_x):
+        # برخورد با پدال؛ prev_x (مکان قبل از این گام) جلوی رد شدن توپ سریع از پدال را می‌گیرد
+        right = paddle.x + PADDLE_W
+        if self.vx < 0:
+            # لبه‌ی چپ توپ در این گام از لبه‌ی راست پدال گذشته یا رویش است
+            if not (self.x < right and prev_x + BALL_SIZE > paddle.x):
+                return False
+        elif not (self.x + BALL_SIZE > paddle.x and prev_x < right):
+            return False
+        if self.y >= paddle.y + PADDLE_H or self.y + BALL_SIZE <= paddle.y:
+            return False
+
+        # فاصله نسبی برخورد (0 بالای پدال، 1 پایین)
+        rel = clamp((self.y + BALL_SIZE / 2 - paddle.y) / PADDLE_H, 0.0, 1.0)
+        # نگاشت به زاویه [-MAX_BOUNCE_DEG, +MAX_BOUNCE_DEG]
+        theta = math.radians((rel - 0.5) * 2 * MAX_BOUNCE_DEG)
+
+        speed = math.hypot(self.vx, self.vy) * BALL_SPEED_GROWTH
+        # معکوس جهت افقی
+        direction = -1 if self.vx > 0 else 1
+
+        self.vx = direction * speed * math.cos(theta)
+        # جهت عمودی از زاویه
+        self.vy = speed * math.sin(theta)
+
+        # جلوگیری از گیر کردن داخل پدال
+        self.x = right if direction > 0 else paddle.x - BALL_SIZE
+        return True
+
+# -------------------- Match --------------------
+# یک بازی بازیکن در برابر CPU؛ همه‌ی وضعیت float ساده است تا گام‌ها سریع باشند
+class Match:
+    def __init__(self, seed=None, difficulty=1.0):
+        self.rng = random.Random(seed)
+        # دشواری (0.6 آسان، 1.0 عادی، 1.2 سخت)
+        self.difficulty = difficulty
+        self.player = Paddle(PADDLE_MARGIN, HEIGHT / 2 - PADDLE_H / 2)
+        self.cpu = Paddle(WIDTH - PADDLE_MARGIN - PADDLE_W, HEIGHT / 2 - PADDLE_H / 2)
+        self.ball = Ball(self.rng)
+        self.player_score = 0
+        self.cpu_score = 0
+        self.time = 0.0
+        self._acc = 0.0
+
+    @property
+    def over(self):
+        return self.player_score >= WIN_SCORE or self.cpu_score >= WIN_SCORE
+
+    def step(self, dt, inputs=Inputs()):
+        # پیشروی به اندازه‌ی dt ثانیه؛ خروجی: NOTHING, HIT, PLAYER_POINT یا CPU_POINT
+        if self.over:
+            return NOTHING
+        self.time += dt
+        ball = self.ball
+        player, cpu = inputs
+        if player is None:
+            self.player.ai_update(ball, dt, self.rng, self.difficulty)
+        elif player:
+            self.player.move(player, dt)
+        if cpu is None:
+            self.cpu.ai_update(ball, dt, self.rng, self.difficulty)
+        elif cpu:
+            self.cpu.move(cpu, dt)
+
+        # به‌روزرسانی توپ و برخورد
+        prev_x = ball.x
+        ball.update(dt)
+        if ball.serving:
+            return NOTHING
+        # برخورد با پدال‌ها
+        if ball.collide_paddle(self.player if ball.vx < 0 else self.cpu, prev_x):
+            return HIT
+
+        # امتیاز
+        if ball.x <= 0:
+            self.cpu_score += 1
+            ball.reset(self.rng, direction=-1)
+            return CPU_POINT
+        if ball.x + BALL_SIZE >= WIDTH:
+            self.player_score += 1
+            ball.reset(self.rng, direction=+1)
+            return PLAYER_POINT
+        return NOTHING
+
+    def advance(self, frame_dt, inputs=Inputs()):
+        # هر تعداد گام ثابت SIM_DT که در frame_dt جا شود (باقی‌مانده برای فریم بعد)؛ خروجی: رویدادها
+        self._acc += min(frame_dt, 0.25)       # بعد از مکث طولانی، شبیه‌سازی جهش نمی‌کند
+        events = []
+        while self._acc >= SIM_DT:
+            self._acc -= SIM_DT
+            ev = self.step(SIM_DT, inputs)
+            if ev:
+                events.append(ev)
+        return events
+
+    def reset_round(self):
+        # ریست فقط توپ/راند
+        self.ball.reset(self.rng, direction=sign(self.ball.vx))
+
+    def reset_match(self):
+        self.player_score = 0
+        self.cpu_score = 0
+        self.player.centery = HEIGHT / 2
+        self.cpu.centery = HEIGHT / 2
+        self.ball.reset(self.rng, direction=self.rng.choice((-1, 1)))
+
+# -------------------- Headless run --------------------
+def run(steps, seed=None, dt=SIM_DT, difficulty=1.0):
+    # CPU در برابر CPU برای steps گام (بعد از هر برد بازی تازه)؛ خروجی: آخرین Match و تعداد برخوردها
+    m = Match(seed, difficulty)
+    both_ai = Inputs(None, None)
+    hits = 0
+    for _ in range(steps):
+        if m.step(dt, both_ai) == HIT:
+            hits += 1
+        if m.over:
+            m.reset_match()
+    return m, hits
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="headless Pong simulation (CPU vs CPU)")
+    p.add_argument("--steps", type=int, default=1_000_000)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--dt", type=float, default=SIM_DT)
+    p.add_argument("--difficulty", type=float, default=1.0)
+    args = p.parse_args(argv)
+    t0 = time.perf_counter()
+    m, hits = run(args.steps, args.seed, args.dt, args.difficulty)
+    elapsed = time.perf_counter() - t0
+    print(f"{args.steps} steps in {elapsed:.2f}s ({args.steps / elapsed:,.0f} steps/s), "
+          f"simulated {m.time:,.0f}s, {hits} paddle hits, score {m.player_score}:{m.cpu_score}")
+
+if __name__ == "__main__":
+    main()